@@ -0,0 +1,31 @@
+"""Add partial index on enabled tools per integration
+
+Revision ID: 20261016_0000
+Revises: e4f5a6b7c8d9
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a6b7c8d9e0'
+down_revision: Union[str, None] = 'e4f5a6b7c8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Agent loading selects only enabled tools per integration
+    op.create_index(
+        "ix_tools_enabled_by_integration",
+        "tools",
+        ["integration_id"],
+        postgresql_where=sa.text("is_enabled"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tools_enabled_by_integration", "tools")
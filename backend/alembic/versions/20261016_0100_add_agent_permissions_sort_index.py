@@ -0,0 +1,30 @@
+"""Add index matching the agent sharing list order
+
+Revision ID: 20261016_0100
+Revises: f5a6b7c8d9e0
+Create Date: 2026-10-16 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6b7c8d9e0f1'
+down_revision: Union[str, None] = 'f5a6b7c8d9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # list_agent_users sorts an agent's permissions admins first, newest first
+    op.create_index(
+        "ix_agent_permissions_sort",
+        "agent_permissions",
+        ["agent_id", sa.text("permission_type DESC"), sa.text("granted_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_permissions_sort", "agent_permissions")
@@ -0,0 +1,48 @@
+"""Add unique API key lookup and tool listing indexes
+
+Revision ID: 20261016_0400
+Revises: a6b7c8d9e0f1
+Create Date: 2026-10-16 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e0f1a2b3c4'
+down_revision: Union[str, None] = 'a6b7c8d9e0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the most recently updated key if concurrent saves ever duplicated one
+    op.execute(
+        """
+        DELETE FROM user_api_keys a
+        USING user_api_keys b
+        WHERE a.user_id = b.user_id
+          AND a.organization_id = b.organization_id
+          AND a.provider = b.provider
+          AND (a.updated_at, a.id) < (b.updated_at, b.id)
+        """
+    )
+    op.create_unique_constraint(
+        "uq_user_api_keys_user_org_provider",
+        "user_api_keys",
+        ["user_id", "organization_id", "provider"],
+    )
+
+    # get_integration_tools filters by integration and orders newest first
+    op.create_index(
+        "ix_tools_integration_created",
+        "tools",
+        ["integration_id", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tools_integration_created", "tools")
+    op.drop_constraint("uq_user_api_keys_user_org_provider", "user_api_keys", type_="unique")
@@ -58,6 +58,7 @@ async def list_agents(
     shared_agents = await permission_service.list_user_agents(
         user_id=current_user["user_id"],
         permission_type="admin" if admin_only else None,
+        load_tools=True,
     )
 
     # Combine and deduplicate (owned agents are already in the list)
@@ -1,7 +1,7 @@
 """Conversations API endpoints."""
 
 import uuid
-from typing import Annotated, Any
+from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -17,6 +17,7 @@ from app.models.integration import Integration
 from app.models.message import Message
 from app.models.tool import Tool
 from app.models.user import User
+from app.services.agent_defaults import build_enhanced_system_prompt
 from app.services.conversation_service import ConversationService
 from app.services.permission_service import PermissionService
 
@@ -24,57 +25,6 @@ from app.services.permission_service import PermissionService
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
 
-def _build_enhanced_system_prompt(base_instructions: str, tool_schemas: list[dict[str, Any]]) -> str:
-    """
-    Build enhanced system prompt that includes default behavioral instructions and tool descriptions.
-    This recreates the exact prompt that was used during agent execution.
-
-    Structure:
-    1. User's custom instructions (from agent.instructions)
-    2. Default behavioral instructions (auto-added at runtime)
-    3. Available tools (auto-added at runtime)
-    """
-    from app.services.agent_defaults import get_default_agent_instructions
-
-    # Start with user's custom instructions
-    enhanced_prompt = base_instructions
-
-    # Append default behavioral instructions
-    default_instructions = get_default_agent_instructions()
-    enhanced_prompt += f"\n\n{default_instructions}"
-
-    # Append tools section if tools are available
-    if not tool_schemas:
-        return enhanced_prompt
-
-    tools_section = "\n\n# Available Tools\n\nYou have access to the following tools:\n\n"
-
-    for tool_schema in tool_schemas:
-        tool_name = tool_schema.get("name", "unknown")
-        tool_description = tool_schema.get("description", "No description")
-        input_schema = tool_schema.get("input_schema", {})
-        properties = input_schema.get("properties", {})
-        required_fields = input_schema.get("required", [])
-
-        tools_section += f"## {tool_name}\n"
-        tools_section += f"{tool_description}\n\n"
-
-        if properties:
-            tools_section += "**Parameters:**\n"
-            for param_name, param_info in properties.items():
-                param_type = param_info.get("type", "string")
-                param_desc = param_info.get("description", "")
-                is_required = param_name in required_fields
-                required_marker = " (REQUIRED)" if is_required else " (optional)"
-
-                tools_section += f"- `{param_name}` ({param_type}){required_marker}: {param_desc}\n"
-            tools_section += "\n"
-        else:
-            tools_section += "No parameters required.\n\n"
-
-    return enhanced_prompt + tools_section
-
-
 class ConversationResponse(BaseModel):
     """Response model for conversation."""
 
@@ -344,7 +294,7 @@ async def get_audit_trail(
                     "full_name": user.full_name,
                 }
 
-        # Build tool schemas (same logic as execution_service._get_tool_schemas)
+        # Build tool schemas (same logic as execution_service._prepare_tools)
         tool_schemas = []
         if conv.agent:
             print(f"[DEBUG] Agent {conv.agent.name} has {len(conv.agent.integrations)} integrations")
@@ -363,7 +313,7 @@ async def get_audit_trail(
         # Build enhanced system prompt with tool documentation
         enhanced_instructions = None
         if conv.agent and conv.agent.instructions:
-            enhanced_instructions = _build_enhanced_system_prompt(
+            enhanced_instructions = build_enhanced_system_prompt(
                 conv.agent.instructions, tool_schemas
             )
             print(f"[DEBUG] Enhanced instructions length: {len(enhanced_instructions) if enhanced_instructions else 0}")
@@ -116,7 +116,8 @@ async def playground_websocket(
                     attachments=attachments,
                     user_id=current_user_id,  # Use authenticated user's ID
                 ):
-                    await websocket.send_json(event.to_dict())
+                    # Events are their own JSON payload
+                    await websocket.send_json(event)
 
                 # Commit session after execution
                 await session.commit()
@@ -22,7 +22,8 @@ async def list_shared_agents(
     (either "use" or "admin") by another user.
     """
     agents = await permission_service.list_user_agents(
-        user_id=current_user["user_id"]
+        user_id=current_user["user_id"],
+        load_tools=True,
     )
 
     return [AgentResponse.model_validate(agent) for agent in agents]
@@ -41,6 +42,7 @@ async def list_shared_agents_admin_only(
     agents = await permission_service.list_user_agents(
         user_id=current_user["user_id"],
         permission_type="admin",
+        load_tools=True,
     )
 
     return [AgentResponse.model_validate(agent) for agent in agents]
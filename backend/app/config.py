@@ -62,6 +62,23 @@ class Settings(BaseSettings):
     tool_execution_timeout: int = 30  # seconds
     max_tool_retries: int = 3
 
+    # Fraction of conversation turns traced to Langfuse (turns with failures are always traced)
+    trace_sample_rate: float = 1.0
+
+    # Response cache for repeated opening messages (0 disables; off by default)
+    response_cache_ttl_seconds: int = 0
+
+    # How long model ID -> provider lookups are cached in-process (0 disables)
+    llm_model_cache_ttl_seconds: int = 300
+
+    # How long decrypted user API keys are cached in-process (0 disables). Keys changed
+    # through another worker are picked up here only after this expires.
+    api_key_cache_ttl_seconds: int = 300
+
+    # Conversation history summarization (estimated tokens, 0 disables)
+    conversation_context_tokens: int = 100000
+    conversation_keep_recent_messages: int = 10
+
     # Subdomain deployment
     subdomain_enabled: bool = True
     base_domain: str = "melton.com"
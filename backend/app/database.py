@@ -20,6 +20,8 @@ engine = create_async_engine(
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
+    # Room for every distinct statement the app issues, so none is recompiled after eviction
+    query_cache_size=1200,
 )
 
 # Create async session factory
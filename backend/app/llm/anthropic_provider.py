@@ -1,5 +1,8 @@
 """Anthropic (Claude) LLM provider implementation."""
 
+import contextlib
+import json
+import logging
 from collections.abc import AsyncIterator
 from typing import Any
 
@@ -8,6 +11,10 @@ from anthropic import AsyncAnthropic
 
 from app.llm.base_provider import BaseLLMProvider, StreamEvent
 
+logger = logging.getLogger(__name__)
+
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
 
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude provider. Direct SDK usage, no LangGraph."""
@@ -28,8 +35,6 @@ class AnthropicProvider(BaseLLMProvider):
 
     async def close(self):
         """Explicitly close the clients."""
-        import contextlib
-
         with contextlib.suppress(Exception):
             await self._httpx_client.aclose()
 
@@ -41,13 +46,11 @@ class AnthropicProvider(BaseLLMProvider):
         system: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        system_context: str | None = None,
     ) -> AsyncIterator[StreamEvent]:
         """Stream Claude response with tool calling."""
-        import logging
-        logger = logging.getLogger(__name__)
-
         # Convert tools to Anthropic format
-        anthropic_tools = [self.convert_tool_schema(tool) for tool in tools]
+        anthropic_tools = self.convert_tools(tools)
         logger.info(f"Sending {len(anthropic_tools)} tools to Anthropic API:")
         for tool in anthropic_tools:
             logger.info(f"  Tool: {tool['name']}")
@@ -76,11 +79,25 @@ class AnthropicProvider(BaseLLMProvider):
                     logger.error(f"    Block {j}: type={block.get('type')}")
         logger.error(f"============================================")
 
+        # Cache breakpoints on the last tool and the static system prompt, so the
+        # tools + system prefix is billed as a cache read on later calls
+        if anthropic_tools:
+            # Copy the last tool - converted tools are shared through the conversion cache
+            last_tool = {**anthropic_tools[-1], "cache_control": _EPHEMERAL_CACHE}
+            anthropic_tools = [*anthropic_tools[:-1], last_tool]
+        system_blocks = []
+        if system:
+            system_blocks.append(
+                {"type": "text", "text": system, "cache_control": _EPHEMERAL_CACHE}
+            )
+        if system_context:
+            system_blocks.append({"type": "text", "text": system_context})
+
         async with self.client.messages.stream(
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=system or "",
+            system=system_blocks,
             messages=messages,
             tools=anthropic_tools,
         ) as stream:
@@ -144,8 +161,6 @@ class AnthropicProvider(BaseLLMProvider):
         max_tokens: int = 4096,
     ) -> dict[str, Any]:
         """Generate structured output matching a JSON schema."""
-        import json
-
         # Build enhanced system prompt with JSON schema instructions
         schema_description = json.dumps(output_schema, indent=2)
         enhanced_system = f"""{system or ''}
@@ -1,5 +1,7 @@
 """Base LLM provider abstract class."""
 
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from typing import Any
@@ -15,19 +17,61 @@ class StreamEvent:
         tool_name: str | None = None,
         tool_input: dict[str, Any] | None = None,
         tool_use_id: str | None = None,
+        tool_input_raw: str | None = None,
     ):
         self.type = event_type
         self.delta = delta
         self.tool_name = tool_name
         self.tool_input = tool_input
         self.tool_use_id = tool_use_id
+        # JSON text the tool input was parsed from, when the provider streams it as text
+        self.tool_input_raw = tool_input_raw
 
 
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers. Keep implementations focused."""
 
+    # Provider-specific tool schemas shared across instances, keyed by (provider class, schema hash)
+    _converted_tools_cache: dict[tuple[str, str], list[Any]] = {}
+    _converted_tools_cache_size = 256
+
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self._last_tools: list[dict[str, Any]] | None = None
+        self._last_converted_tools: list[Any] = []
+
+    def convert_tools(self, tools: list[dict[str, Any]]) -> list[Any]:
+        """
+        Convert a list of tool schemas to provider format, memoizing the result.
+
+        The agentic loop passes the same schema list on every iteration, so the
+        last conversion is reused by identity; otherwise results are looked up by
+        a hash of the schemas so repeated turns of the same agent skip rebuilding.
+
+        Args:
+            tools: Tool schemas in our standard format
+
+        Returns:
+            Provider-specific tool schemas (treat as read-only)
+        """
+        if tools is self._last_tools:
+            return self._last_converted_tools
+
+        serialized = json.dumps(tools, sort_keys=True, default=str).encode()
+        key = (type(self).__name__, hashlib.blake2b(serialized, digest_size=16).hexdigest())
+
+        cache = BaseLLMProvider._converted_tools_cache
+        converted = cache.get(key)
+        if converted is None:
+            converted = [self.convert_tool_schema(tool) for tool in tools]
+            if len(cache) >= self._converted_tools_cache_size:
+                # Evict the oldest entry (dicts preserve insertion order)
+                cache.pop(next(iter(cache)))
+            cache[key] = converted
+
+        self._last_tools = tools
+        self._last_converted_tools = converted
+        return converted
 
     @abstractmethod
     async def stream_with_tools(
@@ -38,6 +82,7 @@ class BaseLLMProvider(ABC):
         system: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        system_context: str | None = None,
     ) -> AsyncIterator[StreamEvent]:
         """
         Stream LLM response with tool calling support.
@@ -46,9 +91,10 @@ class BaseLLMProvider(ABC):
             model: Model identifier
             messages: Conversation history
             tools: Available tools in provider format
-            system: System instructions
+            system: System instructions (stable across turns, so providers may cache them)
             temperature: Generation temperature
             max_tokens: Maximum tokens to generate
+            system_context: Changing instructions placed after the system instructions
 
         Yields:
             StreamEvent objects for content deltas and tool calls
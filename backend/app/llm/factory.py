@@ -1,5 +1,8 @@
 """LLM provider factory for creating provider instances."""
 
+import asyncio
+import contextlib
+import hashlib
 from typing import Literal
 
 from app.llm.anthropic_provider import AnthropicProvider
@@ -11,13 +14,28 @@ from app.llm.openai_provider import OpenAIProvider
 class LLMProviderFactory:
     """Factory for creating LLM provider instances. Single responsibility."""
 
+    # Providers are reused per (provider_type, api key hash) so their HTTP connection
+    # pools stay warm across requests. Google configures its SDK globally per key, so
+    # it is always constructed fresh.
+    _CACHEABLE_PROVIDERS = frozenset({"anthropic", "openai"})
+    _MAX_CACHED_PROVIDERS = 128
+    _providers: dict[tuple[str, str], BaseLLMProvider] = {}
+
+    # Evicted providers may still be streaming for an in-flight request, so they are
+    # closed after a grace period rather than immediately
+    _EVICTED_CLOSE_DELAY_SECONDS = 300.0
+    _closing: set[asyncio.Task] = set()
+
     @staticmethod
     def create_provider(
         provider_type: Literal["anthropic", "openai", "google"],
         api_key: str,
     ) -> BaseLLMProvider:
         """
-        Create an LLM provider instance.
+        Get an LLM provider instance, reusing a cached one for the same key.
+
+        Cached providers are shared between requests - callers must not close them.
+        They are closed on application shutdown via close_all().
 
         Args:
             provider_type: Provider type ('anthropic', 'openai', 'google')
@@ -29,6 +47,26 @@ class LLMProviderFactory:
         Raises:
             ValueError: If provider type is not supported
         """
+        if provider_type not in LLMProviderFactory._CACHEABLE_PROVIDERS:
+            return LLMProviderFactory._build_provider(provider_type, api_key)
+
+        cache = LLMProviderFactory._providers
+        cache_key = (provider_type, hashlib.sha256(api_key.encode()).hexdigest())
+
+        provider = cache.pop(cache_key, None)
+        if provider is None:
+            provider = LLMProviderFactory._build_provider(provider_type, api_key)
+            if len(cache) >= LLMProviderFactory._MAX_CACHED_PROVIDERS:
+                # Drop the least recently used provider and close its connection pool
+                LLMProviderFactory._schedule_close(cache.pop(next(iter(cache))))
+
+        # Re-insert to mark as most recently used
+        cache[cache_key] = provider
+        return provider
+
+    @staticmethod
+    def _build_provider(provider_type: str, api_key: str) -> BaseLLMProvider:
+        """Construct a new provider instance."""
         if provider_type == "anthropic":
             return AnthropicProvider(api_key)
         elif provider_type == "openai":
@@ -37,3 +75,39 @@ class LLMProviderFactory:
             return GoogleProvider(api_key)
         else:
             raise ValueError(f"Unsupported provider type: {provider_type}")
+
+    @staticmethod
+    def _schedule_close(provider: BaseLLMProvider) -> None:
+        """Close an evicted provider in the background once its grace period has passed."""
+        if not hasattr(provider, "close"):
+            return
+
+        task = asyncio.create_task(LLMProviderFactory._close_after_delay(provider))
+        # Keep a reference so the task is not garbage collected before it runs
+        LLMProviderFactory._closing.add(task)
+        task.add_done_callback(LLMProviderFactory._closing.discard)
+
+    @staticmethod
+    async def _close_after_delay(provider: BaseLLMProvider) -> None:
+        """Wait out the grace period (cut short on shutdown), then close the provider."""
+        try:
+            await asyncio.sleep(LLMProviderFactory._EVICTED_CLOSE_DELAY_SECONDS)
+        finally:
+            with contextlib.suppress(Exception):
+                await provider.close()
+
+    @staticmethod
+    async def close_all() -> None:
+        """Close all cached and evicted providers (called on application shutdown)."""
+        closing = list(LLMProviderFactory._closing)
+        for task in closing:
+            task.cancel()
+        await asyncio.gather(*closing, return_exceptions=True)
+
+        providers = list(LLMProviderFactory._providers.values())
+        LLMProviderFactory._providers.clear()
+
+        for provider in providers:
+            if hasattr(provider, "close"):
+                with contextlib.suppress(Exception):
+                    await provider.close()
@@ -23,10 +23,11 @@ class GoogleProvider(BaseLLMProvider):
         system: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        system_context: str | None = None,
     ) -> AsyncIterator[StreamEvent]:
         """Stream Gemini response with function calling."""
         # Convert tools to Gemini format
-        gemini_tools = [self.convert_tool_schema(tool) for tool in tools]
+        gemini_tools = self.convert_tools(tools)
 
         # Create model
         model_instance = genai.GenerativeModel(
@@ -41,6 +42,8 @@ class GoogleProvider(BaseLLMProvider):
         prompt_parts = []
         if system:
             prompt_parts.append(f"Instructions: {system}\n")
+        if system_context:
+            prompt_parts.append(f"{system_context}\n")
 
         for msg in messages:
             role = "User" if msg["role"] == "user" else "Assistant"
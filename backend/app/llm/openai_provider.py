@@ -1,5 +1,9 @@
 """OpenAI (GPT) LLM provider implementation."""
 
+import contextlib
+import copy
+import json
+import logging
 from collections.abc import AsyncIterator
 from typing import Any
 
@@ -7,6 +11,8 @@ from openai import AsyncOpenAI
 
 from app.llm.base_provider import BaseLLMProvider, StreamEvent
 
+logger = logging.getLogger(__name__)
+
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI GPT provider."""
@@ -15,6 +21,11 @@ class OpenAIProvider(BaseLLMProvider):
         super().__init__(api_key)
         self.client = AsyncOpenAI(api_key=api_key)
 
+    async def close(self):
+        """Explicitly close the client."""
+        with contextlib.suppress(Exception):
+            await self.client.close()
+
     async def stream_with_tools(
         self,
         model: str,
@@ -23,17 +34,16 @@ class OpenAIProvider(BaseLLMProvider):
         system: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        system_context: str | None = None,
     ) -> AsyncIterator[StreamEvent]:
         """Stream GPT response with function calling."""
-        import json
-        import logging
-        logger = logging.getLogger(__name__)
-
         # Convert tools to OpenAI format
-        openai_tools = [self.convert_tool_schema(tool) for tool in tools]
+        openai_tools = self.convert_tools(tools)
 
         # Add system message to messages if provided
         all_messages = messages.copy()
+        if system_context:
+            system = f"{system}\n\n{system_context}" if system else system_context
         if system:
             all_messages.insert(0, {"role": "system", "content": system})
 
@@ -89,6 +99,7 @@ class OpenAIProvider(BaseLLMProvider):
                             tool_name=tool_data["name"],
                             tool_input=parsed_args,
                             tool_use_id=tool_data["id"],
+                            tool_input_raw=tool_data["arguments"] or None,
                         )
                     except json.JSONDecodeError as e:
                         logger.error(f"Failed to parse tool arguments: {tool_data['arguments']}, error: {e}")
@@ -132,8 +143,6 @@ class OpenAIProvider(BaseLLMProvider):
         max_tokens: int = 4096,
     ) -> dict[str, Any]:
         """Generate structured output matching a JSON schema."""
-        import json
-
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -165,8 +174,6 @@ class OpenAIProvider(BaseLLMProvider):
 
         except Exception as e:
             # If strict mode fails, fallback to flexible json_object mode
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Strict schema mode failed, falling back to json_object: {e}")
 
             # Enhance system prompt with schema
@@ -206,7 +213,6 @@ Do not include any explanatory text before or after the JSON. Only output the JS
         Transform a JSON schema to meet OpenAI strict mode requirements.
         Recursively adds additionalProperties: false to all objects.
         """
-        import copy
 
         strict_schema = copy.deepcopy(schema)
 
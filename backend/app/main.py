@@ -24,6 +24,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     print("Shutting down Dr. Melton API")
 
+    # Close shared LLM provider clients
+    from app.llm.factory import LLMProviderFactory
+
+    await LLMProviderFactory.close_all()
+
+    # Close the shared outbound HTTP client
+    from app.utils.http_client import close_http_client
+
+    await close_http_client()
+
+    # Send any traces still queued by the Langfuse client
+    from app.utils.observability import observability_service
+
+    observability_service.flush()
+
 
 app = FastAPI(
     title="Dr. Melton API",
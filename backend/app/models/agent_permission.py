@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -41,9 +41,15 @@ class AgentPermission(Base):
     user: Mapped["User"] = relationship("User", foreign_keys=[user_id], back_populates="agent_permissions")
     granter: Mapped["User"] = relationship("User", foreign_keys=[granted_by])
 
-    # Ensure one permission per user per agent
+    # Ensure one permission per user per agent; the index matches the sharing list order
     __table_args__ = (
         UniqueConstraint("agent_id", "user_id", name="uq_agent_permissions_agent_user"),
+        Index(
+            "ix_agent_permissions_sort",
+            "agent_id",
+            text("permission_type DESC"),
+            text("granted_at DESC"),
+        ),
     )
 
     def __repr__(self) -> str:
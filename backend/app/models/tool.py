@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, ForeignKey, String, Text
+from sqlalchemy import JSON, Boolean, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -32,5 +32,16 @@ class Tool(Base):
     # Relationships
     integration: Mapped["Integration"] = relationship("Integration", back_populates="tools")
 
+    # Agents load only enabled tools, so index just those rows per integration;
+    # integration tool listings are ordered newest first
+    __table_args__ = (
+        Index(
+            "ix_tools_enabled_by_integration",
+            "integration_id",
+            postgresql_where=text("is_enabled"),
+        ),
+        Index("ix_tools_integration_created", "integration_id", text("created_at DESC")),
+    )
+
     def __repr__(self) -> str:
         return f"<Tool(id={self.id}, name={self.name}, enabled={self.is_enabled})>"
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,7 +27,16 @@ class UserApiKey(Base):
 
     # Metadata
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    # One key per user, organization and provider; also the index for key lookups
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "organization_id", "provider", name="uq_user_api_keys_user_org_provider"
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<UserApiKey(id={self.id}, user_id={self.user_id}, provider={self.provider})>"
@@ -1,12 +1,18 @@
 """Default agent configuration and instructions."""
 
+import functools
+import json
 from pathlib import Path
+from typing import Any
 
 
+@functools.cache
 def get_default_agent_instructions() -> str:
     """
     Get default agent instructions from template file.
 
+    The template is static, so it is read once per process.
+
     Returns:
         str: Default instructions that should be included in all new agents
     """
@@ -89,3 +95,74 @@ def build_agent_instructions(custom_instructions: str = "") -> str:
         return f"{custom_instructions}\n\n{default_instructions}"
 
     return default_instructions
+
+
+def build_enhanced_system_prompt(base_instructions: str, tool_schemas: list[dict[str, Any]]) -> str:
+    """
+    Build enhanced system prompt that includes default behavioral instructions and tool descriptions.
+
+    Structure:
+    1. User's custom instructions (from agent.instructions)
+    2. Default behavioral instructions (auto-added at runtime)
+    3. Available tools (auto-added at runtime)
+
+    Args:
+        base_instructions: Agent's custom instructions
+        tool_schemas: Tool schemas available to the agent
+
+    Returns:
+        str: Complete system prompt
+    """
+    parts = [base_instructions, "\n\n", get_default_agent_instructions()]
+
+    if tool_schemas:
+        tools_key = tuple(
+            (
+                tool_schema.get("name", "unknown"),
+                tool_schema.get("description", "No description"),
+                json.dumps(tool_schema.get("input_schema", {}), sort_keys=True),
+            )
+            for tool_schema in tool_schemas
+        )
+        parts.append(_render_tools_section(tools_key))
+
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_tools_section(tools_key: tuple[tuple[str, str, str], ...]) -> str:
+    """
+    Render the "Available Tools" section of the system prompt.
+
+    Agents keep the same tools across conversations, so the rendered section is cached
+    on the canonicalized schemas.
+
+    Args:
+        tools_key: Tuple of (name, description, JSON-encoded input schema) per tool
+
+    Returns:
+        Markdown describing the tools and their parameters
+    """
+    parts = ["\n\n# Available Tools\n\nYou have access to the following tools:\n\n"]
+
+    for tool_name, tool_description, input_schema_json in tools_key:
+        input_schema = json.loads(input_schema_json)
+        properties = input_schema.get("properties", {})
+        required_fields = input_schema.get("required", [])
+
+        parts.append(f"## {tool_name}\n{tool_description}\n\n")
+
+        if properties:
+            parts.append("**Parameters:**\n")
+            for param_name, param_info in properties.items():
+                param_type = param_info.get("type", "string")
+                param_desc = param_info.get("description", "")
+                is_required = param_name in required_fields
+                required_marker = " (REQUIRED)" if is_required else " (optional)"
+
+                parts.append(f"- `{param_name}` ({param_type}){required_marker}: {param_desc}\n")
+            parts.append("\n")
+        else:
+            parts.append("No parameters required.\n\n")
+
+    return "".join(parts)
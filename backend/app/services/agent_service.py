@@ -107,7 +107,6 @@ class AgentService:
 
         agent.updated_at = datetime.utcnow()
         await self.session.flush()
-        await self.session.refresh(agent)
 
         return agent
 
@@ -3,9 +3,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.conversation import Conversation
 from app.models.message import Message
@@ -38,50 +37,100 @@ class ConversationService:
         )
         self.session.add(conversation)
         await self.session.flush()
-        await self.session.refresh(conversation)
 
         return conversation
 
     async def get_conversation_by_id(self, conversation_id: uuid.UUID) -> Conversation | None:
-        """Get conversation by ID with messages."""
-        query = (
-            select(Conversation)
-            .where(Conversation.id == conversation_id)
-            .options(selectinload(Conversation.messages))
-        )
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        """
+        Get conversation by ID.
+
+        Messages are not loaded (use get_conversation_history). A conversation already in the
+        session is returned without querying the database.
+        """
+        return await self.session.get(Conversation, conversation_id)
 
     async def get_conversation_history(
-        self, conversation_id: uuid.UUID, limit: int = 50
+        self, conversation_id: uuid.UUID, limit: int = 50, offset: int = 0
     ) -> list[dict[str, str]]:
         """
         Get conversation history in LLM format.
 
+        Returns the first messages of the conversation, oldest first. The agent loop
+        uses get_history_window, which returns the most recent ones instead.
+
         Args:
             conversation_id: Conversation ID
             limit: Maximum number of messages to retrieve
+            offset: Number of leading messages to skip
 
         Returns:
             List of messages in format: [{"role": "user", "content": "..."}, ...]
             Note: "agent" role is converted to "assistant" for LLM API compatibility
         """
         query = (
-            select(Message)
+            select(Message.role, Message.content)
             .where(Message.conversation_id == conversation_id)
             .order_by(Message.created_at.asc())
+            .offset(offset)
             .limit(limit)
         )
         result = await self.session.execute(query)
-        messages = result.scalars().all()
 
         # Convert "agent" role to "assistant" for LLM API compatibility
         return [
             {
-                "role": "assistant" if msg.role == "agent" else msg.role,
-                "content": msg.content,
+                "role": "assistant" if row.role == "agent" else row.role,
+                "content": row.content,
             }
-            for msg in messages
+            for row in result
+        ]
+
+    async def get_history_window(
+        self, conversation_id: uuid.UUID, limit: int = 50, offset: int = 0
+    ) -> tuple[int, list[dict[str, str]]]:
+        """
+        Get the most recent messages after the first offset, and where they start.
+
+        The newest-first sort and the limit run in SQL, so long conversations are never
+        loaded in full. Only role and content are selected.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of (most recent) messages to retrieve
+            offset: Number of leading messages to skip (already covered by a summary)
+
+        Returns:
+            Tuple of (number of messages before the first returned one, messages in LLM format)
+        """
+        numbered = (
+            select(
+                Message.role,
+                Message.content,
+                func.row_number().over(order_by=Message.created_at).label("position"),
+            )
+            .where(Message.conversation_id == conversation_id)
+            .subquery()
+        )
+        query = (
+            select(numbered.c.role, numbered.c.content, numbered.c.position)
+            .where(numbered.c.position > offset)
+            .order_by(numbered.c.position.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+        rows.reverse()
+
+        # Positions are 1-based, so the first row's position is the count of earlier messages
+        start = rows[0].position - 1 if rows else offset
+
+        # Convert "agent" role to "assistant" for LLM API compatibility
+        return start, [
+            {
+                "role": "assistant" if row.role == "agent" else row.role,
+                "content": row.content,
+            }
+            for row in rows
         ]
 
     async def save_message(
@@ -99,9 +148,9 @@ class ConversationService:
             tool_calls=tool_calls or [],
         )
 
+        # Primary key and timestamps are generated client-side, so no refresh is needed
         self.session.add(message)
         await self.session.flush()
-        await self.session.refresh(message)
 
         # Update conversation's last_message_preview and updated_at
         conversation = await self.get_conversation_by_id(conversation_id)
@@ -120,6 +169,24 @@ class ConversationService:
 
         return message
 
+    async def save_summary(
+        self, conversation: Conversation, content: str, message_count: int
+    ) -> None:
+        """
+        Store a summary of the conversation's oldest messages.
+
+        Args:
+            conversation: Conversation to update
+            content: Summary text
+            message_count: Number of leading messages the summary covers
+        """
+        # Reassign the dict so SQLAlchemy detects the JSON change
+        conversation.conversation_metadata = {
+            **(conversation.conversation_metadata or {}),
+            "summary": {"content": content, "message_count": message_count},
+        }
+        await self.session.flush()
+
     async def list_user_conversations(
         self, user_id: uuid.UUID, include_archived: bool = False, limit: int = 50
     ) -> list[Conversation]:
@@ -78,7 +78,6 @@ class CredentialService:
             self.session.add(credential)
 
         await self.session.commit()
-        await self.session.refresh(credential)
         return credential
 
     async def get_credentials(
@@ -1,30 +1,204 @@
 """Agent execution service - orchestrates conversation flow with streaming."""
 
+import asyncio
+import json
+import logging
+import random
+import re
+import secrets
 import time
 import uuid
-from collections.abc import AsyncIterator
-from typing import Any
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
+from typing import Any, TypeVar
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.config import Settings, settings
+from app.llm.base_provider import BaseLLMProvider
 from app.llm.factory import LLMProviderFactory
 from app.models.agent import Agent
+from app.models.conversation import Conversation
+from app.models.integration import Integration
+from app.models.tool import Tool
+from app.services.agent_defaults import build_enhanced_system_prompt
 from app.services.conversation_service import ConversationService
 from app.services.llm_model_service import LLMModelService
-from app.tools.registry import ToolRegistry
+from app.tools.base_tool import BaseTool
+from app.tools.factory import ToolFactory
 from app.utils.observability import observability_service, trace_execution
+from app.utils.response_cache import response_cache
 
+logger = logging.getLogger(__name__)
 
-class ExecutionEvent:
-    """Streaming event for WebSocket communication."""
+
+# Result keys that identify entities created by tools, surfaced back to the LLM
+_ENTITY_ID_KEYS = frozenset({
+    "id", "chart_id", "item_id", "integration_id", "user_id", "product_id",
+    "publication_id", "order_id", "category_id", "grid_id", "size_grid_id",
+})
+
+# System-wide API key per provider, used when the user has not configured their own
+_SYSTEM_API_KEY_GETTERS: dict[str, Callable[[Settings], str | None]] = {
+    "anthropic": lambda config: config.anthropic_api_key,
+    "openai": lambda config: config.openai_api_key,
+    "google": lambda config: config.google_api_key,
+}
+
+# LLM tool schemas keyed by the (id, updated_at) of each enabled tool, shared across turns
+_tool_schemas_cache: dict[tuple[tuple[uuid.UUID, datetime], ...], list[dict[str, Any]]] = {}
+_TOOL_SCHEMAS_CACHE_SIZE = 256
+
+# Error messages that indicate the LLM provider rejected the API key
+_AUTH_ERROR_PATTERN = re.compile(r"api[ _-]?key|authentication|unauthorized|401|403", re.IGNORECASE)
+
+# Streamed text is sent to the client at most once per ~animation frame, or sooner once
+# enough characters have accumulated
+_DELTA_FLUSH_SECONDS = 0.016
+_DELTA_FLUSH_CHARS = 64
+
+# System prompt for folding older turns into a summary
+_SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for an assistant that will continue it. "
+    "Preserve facts, decisions, IDs of created entities and pending items. Be concise."
+)
+
+
+def _image_part_for_provider(url: str, provider_type: str) -> dict[str, Any] | None:
+    """
+    Build a multimodal content part for an image data URL.
+
+    Args:
+        url: Data URL of the form data:image/<type>;base64,<data>
+        provider_type: Provider the message is for
+
+    Returns:
+        Provider-specific image content part, or None if the URL is malformed
+    """
+    if provider_type == "openai":
+        # OpenAI format: image_url with data URL
+        return {"type": "image_url", "image_url": {"url": url}}
+
+    # Anthropic format: image with base64 source. Split rather than regex-match so the
+    # (potentially multi-megabyte) payload is only copied once.
+    header, separator, base64_data = url.partition(",")
+    if not separator or not base64_data or not header.endswith(";base64"):
+        return None
+
+    media_type = header[len("data:"):-len(";base64")]
+    if ";" in media_type:
+        return None
+
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": base64_data,
+        },
+    }
+
+
+
+class ExecutionEvent(dict[str, Any]):
+    """
+    Streaming event for WebSocket communication.
+    Is the JSON payload itself, so streaming a token allocates a single dict.
+    """
+
+    __slots__ = ()
 
     def __init__(self, event_type: str, **data: Any):
-        self.type = event_type
-        self.data = data
+        super().__init__(type=event_type, **data)
+
+    @property
+    def type(self) -> str:
+        """Event type (e.g. "content_delta")."""
+        return self["type"]
+
+
+class _DeltaBatcher:
+    """Coalesces streamed text deltas so the client gets fewer, larger content_delta events."""
+
+    __slots__ = ("_parts", "_chars", "_last_flush")
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._chars = 0
+        self._last_flush = time.perf_counter()
+
+    def add(self, delta: str) -> str | None:
+        """Buffer a delta, returning the batched text once it is due to be sent."""
+        self._parts.append(delta)
+        self._chars += len(delta)
+        if (
+            self._chars >= _DELTA_FLUSH_CHARS
+            or time.perf_counter() - self._last_flush >= _DELTA_FLUSH_SECONDS
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> str | None:
+        """Return all buffered text (None if there is none) and reset the buffer."""
+        self._last_flush = time.perf_counter()
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._chars = 0
+        return text
+
+    def seconds_until_due(self) -> float | None:
+        """Time left until buffered text is due to be sent, or None if nothing is buffered."""
+        if not self._parts:
+            return None
+        return max(0.0, self._last_flush + _DELTA_FLUSH_SECONDS - time.perf_counter())
+
+
+_T = TypeVar("_T")
+
+
+async def _with_flush_ticks(
+    events: AsyncIterator[_T], batcher: _DeltaBatcher
+) -> AsyncIterator[_T | None]:
+    """
+    Yield a stream's events, plus None whenever buffered text falls due while it is idle.
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {"type": self.type, **self.data}
+    Providers go quiet while they stream a tool call's arguments, so without the ticks
+    the text before the call would wait for the next event instead of a frame interval.
+    """
+    iterator = aiter(events)
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                if batcher.seconds_until_due() is None:
+                    # Nothing is buffered, so no deadline: wait for the event directly
+                    try:
+                        event = await anext(iterator)
+                    except StopAsyncIteration:
+                        return
+                    yield event
+                    continue
+                pending = asyncio.ensure_future(anext(iterator))
+
+            done, _ = await asyncio.wait((pending,), timeout=batcher.seconds_until_due())
+            if not done:
+                yield None
+                continue
+
+            next_event, pending = pending, None
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
 
 
 class AgentExecutionService:
@@ -38,9 +212,10 @@ class AgentExecutionService:
         self.session = session
         self.conversation_service = ConversationService(session)
         self.llm_model_service = LLMModelService(session)
-        self.tool_registry = ToolRegistry()
+        # Tools available in this conversation, by schema name. Kept per service instance
+        # (one per request) so concurrent conversations never see each other's tools.
+        self._tools: dict[str, BaseTool] = {}
 
-    @trace_execution("agent_conversation")
     async def execute_conversation(
         self,
         agent_id: uuid.UUID,
@@ -64,6 +239,36 @@ class AgentExecutionService:
         Yields:
             ExecutionEvent objects for streaming to client
         """
+        # Only sampled turns run inside a Langfuse trace; a sampled-out turn that fails is
+        # still reported, as a standalone trace, once it ends
+        trace_sampled = random.random() < settings.trace_sample_rate
+        execute_turn = self._execute_traced_turn if trace_sampled else self._execute_turn
+        async for event in execute_turn(
+            agent_id,
+            user_message,
+            conversation_id,
+            user_api_keys,
+            attachments,
+            user_id,
+            trace_sampled=trace_sampled,
+        ):
+            yield event
+
+    async def _execute_turn(
+        self,
+        agent_id: uuid.UUID,
+        user_message: str,
+        conversation_id: uuid.UUID | None,
+        user_api_keys: dict[str, str] | None,
+        attachments: list[dict] | None,
+        user_id: uuid.UUID | None,
+        trace_sampled: bool,
+    ) -> AsyncIterator[ExecutionEvent]:
+        """Run one conversation turn (see execute_conversation)."""
+        turn_failed = False
+        error_message: str | None = None
+        # Tool traces are only collected when Langfuse is configured
+        tool_traces: list[dict[str, Any]] | None = [] if observability_service.enabled else None
         try:
             # 1. Load agent configuration
             agent = await self._load_agent(agent_id)
@@ -73,8 +278,8 @@ class AgentExecutionService:
 
             yield ExecutionEvent("agent_loaded", agent_id=str(agent.id))
 
-            # 2. Register agent tools
-            await self._register_agent_tools(agent, user_api_keys)
+            # 2. Resolve LLM tool providers (the only DB access tool setup needs)
+            llm_tool_providers = await self._resolve_llm_tool_providers(agent)
 
             # 3. Get or create conversation (STATEFUL)
             conversation = await self.conversation_service.get_or_create_conversation(
@@ -91,24 +296,70 @@ class AgentExecutionService:
                 conversation_id=conversation.id, role="user", content=user_message
             )
 
-            # 5. Build conversation history
-            history = await self.conversation_service.get_conversation_history(conversation.id)
-
-            # 6. Get tool schemas
-            tool_schemas = await self._get_tool_schemas(agent)
-
-            # DEBUG: Log tool schemas being sent to LLM
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"========== TOOL SCHEMAS FOR LLM ==========")
-            for schema in tool_schemas:
-                logger.error(f"Tool: {schema.get('name')}")
-                logger.error(f"Description: {schema.get('description')}")
-                logger.error(f"Input schema: {schema.get('input_schema')}")
-            logger.error(f"===========================================")
+            # 5. Build conversation history, registering tools and building their schemas
+            # while the history query is in flight (the session only runs one query at a time,
+            # so tool setup must not touch the database here)
+            # Messages already folded into the stored summary are skipped in SQL, and only
+            # the most recent ones are loaded
+            summary = (conversation.conversation_metadata or {}).get("summary")
+            summarized_count = summary["message_count"] if summary else 0
+            history_task = asyncio.create_task(
+                self.conversation_service.get_history_window(
+                    conversation.id, offset=summarized_count
+                )
+            )
+            await asyncio.sleep(0)  # Let the history query start before the CPU-bound work
+            try:
+                tool_schemas = self._prepare_tools(agent, user_api_keys, llm_tool_providers)
+            finally:
+                history_start, history = await history_task
+
+            # Opening messages without attachments can be answered from the response cache
+            response_cache_key = None
+            if response_cache.enabled and not attachments and not summary and len(history) == 1:
+                response_cache_key = response_cache.build_key(
+                    str(agent.id),
+                    str(user_id) if user_id else None,
+                    agent.model_config,
+                    agent.instructions,
+                    tool_schemas,
+                    user_message,
+                )
+                cached_response = response_cache.get(response_cache_key)
+                if cached_response is not None:
+                    # Saved while the response is delivered, like uncached responses
+                    save_cached_task = asyncio.create_task(
+                        self.conversation_service.save_message(
+                            conversation_id=conversation.id,
+                            role="agent",
+                            content=cached_response,
+                            tool_calls=[],
+                        )
+                    )
+                    try:
+                        yield ExecutionEvent("content_delta", delta=cached_response)
+                        yield ExecutionEvent("message_complete", message_id=secrets.token_hex(8))
+                    finally:
+                        await save_cached_task
+                    return
+
+            # Log tool schemas being sent to LLM (only formatted when debug logging is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                for schema in tool_schemas:
+                    logger.debug(
+                        "Tool: %s desc=%s schema=%s",
+                        schema.get("name"),
+                        schema.get("description"),
+                        schema.get("input_schema"),
+                    )
 
-            # 7. Get LLM provider
-            provider_type = agent.model_config.get("provider", "anthropic")
+            # 6. Get LLM provider
+            # Model settings are read once - they are fixed for the whole turn
+            model_config = agent.model_config
+            provider_type = model_config.get("provider", "anthropic")
+            model = model_config.get("model")
+            temperature = model_config.get("temperature", 0.7)
+            max_tokens = model_config.get("max_tokens", 4096)
             api_key = self._get_api_key(provider_type, user_api_keys)
 
             # Check if API key is configured
@@ -122,182 +373,214 @@ class AgentExecutionService:
                 return
 
             provider = LLMProviderFactory.create_provider(provider_type, api_key)
+            save_response_task: asyncio.Task | None = None
 
             try:
-                # 8. Build enhanced system prompt with tool descriptions (STATIC)
-                enhanced_instructions = self._build_enhanced_system_prompt(agent.instructions, tool_schemas)
+                # 7. Build enhanced system prompt with tool descriptions (STATIC)
+                enhanced_instructions = build_enhanced_system_prompt(agent.instructions, tool_schemas)
+
+                # Fold older turns into a summary once the history nears the context budget
+                summary_content = await self._maybe_summarize(
+                    conversation,
+                    history,
+                    summary["content"] if summary else None,
+                    summarized_count,
+                    history_start,
+                    provider,
+                    model,
+                )
+                # Kept out of the static prompt so provider-side prompt caching still applies
+                system_context = (
+                    f"# Summary of Earlier Conversation\n\n{summary_content}" if summary_content else None
+                )
 
-                # DEBUG: Log enhanced system prompt
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"========== ENHANCED SYSTEM PROMPT ==========")
-                logger.error(enhanced_instructions)
-                logger.error(f"==========================================")
+                logger.debug("Enhanced system prompt: %s", enhanced_instructions)
 
-                # 9. Agentic loop - continue until LLM responds without calling tools
+                # 8. Agentic loop - continue until LLM responds without calling tools
                 max_iterations = 15  # Allow up to 15 tool calls
                 iteration = 0
                 consecutive_failures = 0  # Track consecutive failed tool calls (global, for logging)
                 tool_failure_counts = {}  # Track consecutive failures per tool
-                conversation_messages = history.copy()
+                # get_history_window returns a fresh list, so it is extended in place
+                conversation_messages = history
 
-                # 9a. If user attached files, enhance the last user message with image content
-                if attachments and len(conversation_messages) > 0:
+                # 8a. If user attached files, enhance the last user message with image content
+                # The user message was just saved, so it is the last entry in the history
+                if attachments and conversation_messages and conversation_messages[-1].get("role") == "user":
                     # Extract image URLs from attachments
                     image_urls = [att.get("url") for att in attachments if att.get("url")]
 
                     if image_urls:
-                        # Find the last user message and enhance it
-                        for i in range(len(conversation_messages) - 1, -1, -1):
-                            if conversation_messages[i].get("role") == "user":
-                                # Convert content to multimodal format with text + images
-                                current_content = conversation_messages[i].get("content", "")
-
-                                # Build content array with text and images
-                                content_parts = []
-
-                                # Add text if present
-                                if current_content and current_content.strip():
-                                    content_parts.append({"type": "text", "text": current_content})
-
-                                # Add public URLs information if available
-                                attachments_with_public_urls = [
-                                    att for att in attachments
-                                    if att.get("publicUrl")
-                                ]
-                                if attachments_with_public_urls:
-                                    public_urls_text = "\n\n[Attached images uploaded to server - public URLs for API calls:\n"
-                                    for idx, att in enumerate(attachments_with_public_urls, 1):
-                                        public_urls_text += f"Image {idx}: {att.get('publicUrl')}\n"
-                                    public_urls_text += "]"
-                                    content_parts.append({"type": "text", "text": public_urls_text})
-
-                                # Add images - format depends on provider
-                                for url in image_urls:
-                                    if url.startswith("data:image/"):
-                                        if provider_type == "openai":
-                                            # OpenAI format: image_url with data URL
-                                            content_parts.append({
-                                                "type": "image_url",
-                                                "image_url": {
-                                                    "url": url
-                                                }
-                                            })
-                                        else:
-                                            # Anthropic format: image with base64 source
-                                            import re
-                                            match = re.match(r"data:(image/[^;]+);base64,(.+)", url)
-                                            if match:
-                                                media_type = match.group(1)
-                                                base64_data = match.group(2)
-                                                content_parts.append({
-                                                    "type": "image",
-                                                    "source": {
-                                                        "type": "base64",
-                                                        "media_type": media_type,
-                                                        "data": base64_data,
-                                                    }
-                                                })
-
-                                # Update message with multimodal content
-                                if content_parts:
-                                    conversation_messages[i]["content"] = content_parts
-
-                                break
+                        last_user_message = conversation_messages[-1]
+
+                        # Convert content to multimodal format with text + images
+                        current_content = last_user_message.get("content", "")
+
+                        # Build content array with text and images
+                        content_parts = []
+
+                        # Add text if present
+                        if current_content and current_content.strip():
+                            content_parts.append({"type": "text", "text": current_content})
+
+                        # Add public URLs information if available
+                        attachments_with_public_urls = [
+                            att for att in attachments
+                            if att.get("publicUrl")
+                        ]
+                        if attachments_with_public_urls:
+                            public_urls_text = "\n\n[Attached images uploaded to server - public URLs for API calls:\n"
+                            for idx, att in enumerate(attachments_with_public_urls, 1):
+                                public_urls_text += f"Image {idx}: {att.get('publicUrl')}\n"
+                            public_urls_text += "]"
+                            content_parts.append({"type": "text", "text": public_urls_text})
+
+                        # Add images - format depends on provider
+                        for url in image_urls:
+                            if url.startswith("data:image/"):
+                                image_part = _image_part_for_provider(url, provider_type)
+                                if image_part:
+                                    content_parts.append(image_part)
+
+                        # Update message with multimodal content
+                        if content_parts:
+                            last_user_message["content"] = content_parts
 
                 all_tool_calls = []
                 final_response_content = ""
                 created_entities = {}  # Track entities created during execution (IDs, references, etc.)
+                # Outcome window over the last 5 tool calls: tool name if it succeeded, else None
+                recent_tool_outcomes: deque[str | None] = deque(maxlen=5)
+                # The provider is fixed for the whole turn, so resolve its message format once
+                append_tool_round = self._get_tool_round_builder(provider_type)
+                # Per-iteration buffers, reused across iterations. Tool round builders copy what
+                # they keep, so the lists are never referenced after their iteration.
+                assistant_text_parts: list[str] = []
+                tool_uses: list[dict[str, Any]] = []  # Track tool uses in this turn
+                delta_batcher = _DeltaBatcher()
 
                 while iteration < max_iterations:
                     iteration += 1
 
                     # Stream LLM response
-                    assistant_content = ""
-                    tool_uses = []  # Track tool uses in this turn
+                    assistant_text_parts.clear()
+                    tool_uses.clear()
 
-                    async for event in provider.stream_with_tools(
-                        model=agent.model_config.get("model"),
+                    stream = provider.stream_with_tools(
+                        model=model,
                         messages=conversation_messages,
                         tools=tool_schemas,
                         system=enhanced_instructions,
-                        temperature=agent.model_config.get("temperature", 0.7),
-                        max_tokens=agent.model_config.get("max_tokens", 4096),
-                    ):
-                        if event.type == "content_delta":
-                            assistant_content += event.delta
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        system_context=system_context,
+                    )
+                    async for event in _with_flush_ticks(stream, delta_batcher):
+                        if event is None:
+                            # The stream went idle with text buffered past its frame interval
+                            delta = delta_batcher.flush()
+                            if delta:
+                                yield ExecutionEvent("content_delta", delta=delta)
+
+                        elif event.type == "content_delta":
+                            assistant_text_parts.append(event.delta)
                             # Stream content to user - will determine if this is final response later
-                            yield ExecutionEvent("content_delta", delta=event.delta)
+                            delta = delta_batcher.add(event.delta)
+                            if delta:
+                                yield ExecutionEvent("content_delta", delta=delta)
 
                         elif event.type == "tool_use_start":
+                            # Text before the tool call must reach the client first
+                            delta = delta_batcher.flush()
+                            if delta:
+                                yield ExecutionEvent("content_delta", delta=delta)
+
                             yield ExecutionEvent(
                                 "tool_use_start",
                                 tool_name=event.tool_name,
                                 tool_input=event.tool_input,
                             )
 
-                            # Execute tool
-                            start_time = time.time()
-                            tool_result = await self._execute_tool(event.tool_name, event.tool_input or {})
-                            duration_ms = int((time.time() - start_time) * 1000)
-
-                            # Track consecutive failures per tool
-                            tool_success = tool_result.get("success", True)
-                            tool_name = event.tool_name
-
-                            if not tool_success:
-                                # Increment failure count for this specific tool
-                                tool_failure_counts[tool_name] = tool_failure_counts.get(tool_name, 0) + 1
-                                consecutive_failures += 1  # Keep global counter for logging
-                                logger.info(f"Tool {tool_name} failed (consecutive failures: {tool_failure_counts[tool_name]})")
-                            else:
-                                # Reset failure count for this specific tool
-                                tool_failure_counts[tool_name] = 0
-                                consecutive_failures = 0
-                                logger.info(f"Tool {tool_name} succeeded - resetting its failure counter")
-
-                                # Track created entities from successful tool calls
-                                # Look for common ID patterns in the result
-                                result_data = tool_result.get("result", {}) if isinstance(tool_result.get("result"), dict) else {}
-                                common_id_keys = ["id", "chart_id", "item_id", "integration_id", "user_id", "product_id",
-                                                  "publication_id", "order_id", "category_id", "grid_id", "size_grid_id"]
-                                for key in common_id_keys:
-                                    if key in result_data and result_data[key]:
-                                        created_entities[key] = result_data[key]
-                                        logger.info(f"Tracked created entity: {key}={result_data[key]}")
-
-                            # Trace tool execution
-                            observability_service.trace_tool_execution(
-                                tool_name=event.tool_name,
-                                input_data=event.tool_input or {},
-                                output_data=tool_result,
-                                duration_ms=duration_ms,
-                                success=tool_success,
-                            )
-
-                            # Track tool use with ID
+                            # Execute after the stream ends so independent calls can overlap
                             tool_uses.append({
                                 "id": event.tool_use_id,
                                 "name": event.tool_name,
                                 "input": event.tool_input or {},
-                                "result": tool_result,
+                                "input_json": event.tool_input_raw,
                             })
 
-                            all_tool_calls.append({
-                                "tool_name": event.tool_name,
-                                "input": event.tool_input,
-                                "output": tool_result,
+                    delta = delta_batcher.flush()
+                    if delta:
+                        yield ExecutionEvent("content_delta", delta=delta)
+                    assistant_content = "".join(assistant_text_parts)
+
+                    # Execute tools requested in this turn (concurrently when all are parallel-safe),
+                    # reporting each one to the client as soon as it finishes
+                    async for index, tool_result, duration_ms in self._execute_tool_calls(tool_uses):
+                        tool_use = tool_uses[index]
+                        tool_use["result"] = tool_result
+                        tool_use["duration_ms"] = duration_ms
+
+                        yield ExecutionEvent(
+                            "tool_use_complete",
+                            tool_name=tool_use["name"],
+                            result=tool_result,
+                        )
+
+                    # Bookkeeping in request order, so failure tracking stays deterministic
+                    for tool_use in tool_uses:
+                        tool_result = tool_use["result"]
+
+                        # Track consecutive failures per tool
+                        tool_success = tool_result.get("success", True)
+                        tool_name = tool_use["name"]
+
+                        if not tool_success:
+                            turn_failed = True
+                            # Increment failure count for this specific tool
+                            tool_failure_counts[tool_name] = tool_failure_counts.get(tool_name, 0) + 1
+                            consecutive_failures += 1  # Keep global counter for logging
+                            logger.info("Tool %s failed (consecutive failures: %s)", tool_name, tool_failure_counts[tool_name])
+                        else:
+                            # Reset failure count for this specific tool
+                            tool_failure_counts[tool_name] = 0
+                            consecutive_failures = 0
+                            logger.info("Tool %s succeeded - resetting its failure counter", tool_name)
+
+                            # Track created entities from successful tool calls
+                            # Look for common ID patterns in the result
+                            result_data = tool_result.get("result", {}) if isinstance(tool_result.get("result"), dict) else {}
+                            # Sorted so the entities summary in the prompt is deterministic
+                            for key in sorted(_ENTITY_ID_KEYS & result_data.keys()):
+                                if result_data[key]:
+                                    created_entities[key] = result_data[key]
+                                    logger.info("Tracked created entity: %s=%s", key, result_data[key])
+
+                        # Trace tool execution (sent in one batch when the turn ends)
+                        if tool_traces is not None:
+                            tool_traces.append({
+                                "tool_name": tool_name,
+                                "input_data": tool_use["input"],
+                                "output_data": tool_result,
+                                "duration_ms": tool_use["duration_ms"],
+                                "success": tool_success,
                             })
 
-                            yield ExecutionEvent(
-                                "tool_use_complete",
-                                tool_name=event.tool_name,
-                                result=tool_result,
-                            )
+                        recent_tool_outcomes.append(
+                            tool_name if tool_result.get("success", False) else None
+                        )
+
+                        all_tool_calls.append({
+                            "tool_name": tool_name,
+                            "input": tool_use["input"],
+                            "output": tool_result,
+                        })
 
                     # If no tools were called, we have the final response
                     if len(tool_uses) == 0:
                         final_response_content = assistant_content
+                        if response_cache_key and not all_tool_calls and final_response_content:
+                            response_cache.set(response_cache_key, final_response_content)
                         break
 
                     # Check stop conditions
@@ -305,177 +588,90 @@ class AgentExecutionService:
 
                     # If tools were called, complete this message before continuing
                     # This creates a separate message bubble for this thinking/tool-calling iteration
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"ITERATION {iteration}: tool_uses={len(tool_uses)}, total_calls={total_tool_calls}, consecutive_failures={consecutive_failures}, tool_failure_counts={tool_failure_counts}, assistant_content='{assistant_content[:100] if assistant_content else 'EMPTY'}'")
+                    logger.debug(
+                        "Iteration %s: tool_uses=%s, total_calls=%s, consecutive_failures=%s, tool_failure_counts=%s",
+                        iteration,
+                        len(tool_uses),
+                        total_tool_calls,
+                        consecutive_failures,
+                        tool_failure_counts,
+                    )
 
                     if assistant_content:
-                        logger.error(f"Sending message_complete after iteration {iteration} with content")
-                        yield ExecutionEvent("message_complete", message_id=str(uuid.uuid4()))
-                    else:
-                        logger.error(f"NOT sending message_complete - no assistant content in iteration {iteration}")
+                        yield ExecutionEvent("message_complete", message_id=secrets.token_hex(8))
 
                     # Check if we should stop due to limits
                     # Check if any single tool has failed 2 times in a row
                     max_tool_failures = max(tool_failure_counts.values()) if tool_failure_counts else 0
                     if max_tool_failures >= 2:
                         failing_tool = [k for k, v in tool_failure_counts.items() if v >= 2][0]
-                        logger.error(f"Stopping: tool {failing_tool} failed 2 times in a row")
+                        logger.warning("Stopping: tool %s failed 2 times in a row", failing_tool)
                         final_response_content = f"The {failing_tool} operation has failed 2 times in a row. Let me know if you'd like me to try a different approach or if you can provide additional information."
                         yield ExecutionEvent("content_delta", delta=final_response_content)
                         break
 
                     if total_tool_calls >= 15:
-                        logger.error(f"Stopping: 15 tool calls limit reached")
+                        logger.warning("Stopping: 15 tool calls limit reached")
                         final_response_content = f"I've reached the limit of 15 tool calls for this turn. I've made progress, but may need to continue in the next message. Let me know if you'd like me to continue or if you need clarification on what I've done so far."
                         yield ExecutionEvent("content_delta", delta=final_response_content)
                         break
 
-                    # Build messages in provider-specific format
-                    if provider_type == "anthropic":
-                        # Anthropic format: content blocks with tool_use
-                        assistant_message_content = []
-                        if assistant_content:
-                            assistant_message_content.append({"type": "text", "text": assistant_content})
-
-                        for tool_use in tool_uses:
-                            assistant_message_content.append({
-                                "type": "tool_use",
-                                "id": tool_use["id"],
-                                "name": tool_use["name"],
-                                "input": tool_use["input"],
-                            })
+                    # Build the progress footer once per iteration - it is the same for every tool result
+                    # and always follows the (variable) result text
+                    recent_successes = [name for name in recent_tool_outcomes if name is not None]
+                    context_summary = ""
+                    if recent_successes:
+                        context_summary = f"\n[Recent successful operations: {', '.join(recent_successes)}]"
 
-                        conversation_messages.append({
-                            "role": "assistant",
-                            "content": assistant_message_content,
-                        })
+                    # Entities are sorted so identical state always renders identical text,
+                    # keeping the appended messages byte-stable for provider prompt caching
+                    entities_info = ""
+                    if created_entities:
+                        entities_info = f"\n[Created entities available for use: {', '.join(f'{k}={v}' for k, v in sorted(created_entities.items()))}]"
 
-                        # Anthropic format: user message with tool_result blocks
-                        tool_results_content = []
-                        for tool_use in tool_uses:
-                            tool_result = tool_use["result"]
-                            if isinstance(tool_result, dict) and not tool_result.get("success", True):
-                                result_str = tool_result.get("error", str(tool_result))
-                            else:
-                                result_str = str(tool_result.get("result", tool_result))
-
-                            # Build context summary
-                            recent_successes = [tc for tc in all_tool_calls[-5:] if tc.get("output", {}).get("success", False)]
-                            context_summary = ""
-                            if recent_successes:
-                                context_summary = "\n[Recent successful operations: "
-                                context_summary += ", ".join([f"{tc['tool_name']}" for tc in recent_successes])
-                                context_summary += "]"
-
-                            # Add created entities info
-                            entities_info = ""
-                            if created_entities:
-                                entities_info = "\n[Created entities available for use: " + ", ".join([f"{k}={v}" for k, v in created_entities.items()]) + "]"
-
-                            # Add progress tracking to help LLM stay aware
-                            progress_info = f"\n\n[Progress: {total_tool_calls}/{max_iterations} tool calls made, {consecutive_failures} consecutive failures]{context_summary}{entities_info}"
-                            result_str = result_str + progress_info
-
-                            tool_results_content.append({
-                                "type": "tool_result",
-                                "tool_use_id": tool_use["id"],
-                                "content": result_str,
-                            })
-
-                        conversation_messages.append({
-                            "role": "user",
-                            "content": tool_results_content,
-                        })
+                    # Add progress tracking to help LLM stay aware
+                    progress_info = f"\n\n[Progress: {total_tool_calls}/{max_iterations} tool calls made, {consecutive_failures} consecutive failures]{context_summary}{entities_info}"
 
-                    else:
-                        # OpenAI/Google format: assistant message with tool_calls
-                        import json
-
-                        tool_calls_array = []
-                        for tool_use in tool_uses:
-                            tool_calls_array.append({
-                                "id": tool_use["id"],
-                                "type": "function",
-                                "function": {
-                                    "name": tool_use["name"],
-                                    "arguments": json.dumps(tool_use["input"]),
-                                }
-                            })
-
-                        assistant_msg = {
-                            "role": "assistant",
-                            "tool_calls": tool_calls_array,
-                        }
-                        if assistant_content:
-                            assistant_msg["content"] = assistant_content
-                        else:
-                            assistant_msg["content"] = None
-
-                        conversation_messages.append(assistant_msg)
-
-                        # OpenAI/Google format: separate tool messages for each result
-                        for tool_use in tool_uses:
-                            tool_result = tool_use["result"]
-                            if isinstance(tool_result, dict) and not tool_result.get("success", True):
-                                result_str = tool_result.get("error", str(tool_result))
-                            else:
-                                result_str = str(tool_result.get("result", tool_result))
-
-                            # Build context summary
-                            recent_successes = [tc for tc in all_tool_calls[-5:] if tc.get("output", {}).get("success", False)]
-                            context_summary = ""
-                            if recent_successes:
-                                context_summary = "\n[Recent successful operations: "
-                                context_summary += ", ".join([f"{tc['tool_name']}" for tc in recent_successes])
-                                context_summary += "]"
-
-                            # Add created entities info
-                            entities_info = ""
-                            if created_entities:
-                                entities_info = "\n[Created entities available for use: " + ", ".join([f"{k}={v}" for k, v in created_entities.items()]) + "]"
-
-                            # Add progress tracking to help LLM stay aware
-                            progress_info = f"\n\n[Progress: {total_tool_calls}/{max_iterations} tool calls made, {consecutive_failures} consecutive failures]{context_summary}{entities_info}"
-                            result_str = result_str + progress_info
-
-                            conversation_messages.append({
-                                "role": "tool",
-                                "tool_call_id": tool_use["id"],
-                                "content": result_str,
-                            })
+                    # Build messages in provider-specific format
+                    append_tool_round(conversation_messages, assistant_content, tool_uses, progress_info)
 
                     # Continue loop to get next LLM response
 
-                # 9. Save agent response
-                await self.conversation_service.save_message(
-                    conversation_id=conversation.id,
-                    role="agent",
-                    content=final_response_content,
-                    tool_calls=all_tool_calls,
+                # 9. Save agent response - runs while message_complete is delivered,
+                # awaited in the finally block so it is durable before we return
+                save_response_task = asyncio.create_task(
+                    self.conversation_service.save_message(
+                        conversation_id=conversation.id,
+                        role="agent",
+                        content=final_response_content,
+                        tool_calls=all_tool_calls,
+                    )
                 )
 
                 # Trace LLM call
-                observability_service.trace_llm_call(
-                    model=agent.model_config.get("model"),
-                    provider=provider_type,
-                    input_data={"messages": history, "system": agent.instructions},
-                    output_data=final_response_content,
-                    metadata={"tool_calls": len(all_tool_calls), "iterations": iteration},
-                )
+                if trace_sampled:
+                    observability_service.trace_llm_call(
+                        model=model,
+                        provider=provider_type,
+                        input_data={"messages": conversation_messages, "system": agent.instructions},
+                        output_data=final_response_content,
+                        metadata={"tool_calls": len(all_tool_calls), "iterations": iteration},
+                    )
 
-                yield ExecutionEvent("message_complete", message_id=str(uuid.uuid4()))
+                yield ExecutionEvent("message_complete", message_id=secrets.token_hex(8))
 
             finally:
-                # Clean up provider
-                if hasattr(provider, 'close'):
-                    await provider.close()
+                # Make sure the agent response is persisted (re-raises save errors).
+                # The provider is shared via LLMProviderFactory and must not be closed here.
+                if save_response_task is not None:
+                    await save_response_task
 
         except Exception as e:
+            turn_failed = True
             error_message = str(e)
 
             # Check if it's an API key authentication error
-            if any(keyword in error_message.lower() for keyword in ["api key", "authentication", "unauthorized", "401", "403"]):
+            if _AUTH_ERROR_PATTERN.search(error_message):
                 provider_name = agent.model_config.get("provider", "LLM").capitalize()
                 yield ExecutionEvent(
                     "error",
@@ -485,91 +681,351 @@ class AgentExecutionService:
             else:
                 yield ExecutionEvent("error", error=error_message)
         finally:
-            # Flush traces
-            observability_service.flush()
+            # Langfuse ships traces from its own background thread, so nothing is flushed
+            # here - a blocking flush per turn would delay the end of the stream
+            if trace_sampled:
+                if tool_traces:
+                    observability_service.trace_tool_executions(tool_traces)
+            elif turn_failed:
+                observability_service.trace_failed_turn(
+                    "agent_conversation",
+                    {"agent_id": str(agent_id), "user_message": user_message},
+                    error_message,
+                    tool_traces or [],
+                )
+
+    # The same turn run inside a Langfuse trace, for sampled turns
+    _execute_traced_turn = trace_execution("agent_conversation")(_execute_turn)
 
     async def _load_agent(self, agent_id: uuid.UUID) -> Agent | None:
         """Load agent by ID with relationships eagerly loaded."""
-        from sqlalchemy import select
-        from sqlalchemy.orm import selectinload
-
-        from app.models.integration import Integration
-
+        # Filter disabled tools in SQL so they are never loaded or iterated
         query = (
             select(Agent)
             .where(Agent.id == agent_id)
-            .options(selectinload(Agent.integrations).selectinload(Integration.tools))
+            .options(
+                selectinload(Agent.integrations).selectinload(
+                    Integration.tools.and_(Tool.is_enabled.is_(True))
+                )
+            )
         )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def _get_tool_schemas(self, agent: Agent) -> list[dict[str, Any]]:
-        """Get tool schemas for agent's enabled tools."""
-        import logging
-        logger = logging.getLogger(__name__)
-
-        tool_schemas = []
-
-        for integration in agent.integrations:
-            for tool in integration.tools:
-                if tool.is_enabled:
-                    # Build schema dynamically - description comes from tool.description, not tool_schema
-                    schema = {
-                        "name": tool.tool_schema.get("name", tool.name),
-                        "description": tool.description or tool.tool_schema.get("description", ""),
-                        "input_schema": tool.tool_schema.get("input_schema", {"type": "object", "properties": {}}),
-                    }
-                    tool_schemas.append(schema)
-                    logger.info(f"Adding tool schema for LLM: {tool.name} -> {schema}")
+    async def _resolve_llm_tool_providers(self, agent: Agent) -> dict[str, str]:
+        """
+        Look up the provider for each model used by the agent's LLM tools.
+
+        Returns:
+            Mapping of model ID to provider name
+        """
+        tool_models = {
+            tool.config.get("llm_model", "")
+            for integration in agent.integrations
+            for tool in integration.tools
+            if tool.tool_type == "llm"
+        }
+
+        # One query for all models rather than one per LLM tool
+        return await self.llm_model_service.get_providers_for_models(tool_models)
+
+    def _prepare_tools(
+        self,
+        agent: Agent,
+        user_api_keys: dict[str, str] | None,
+        llm_tool_providers: dict[str, str],
+    ) -> list[dict[str, Any]]:
+        """
+        Register the agent's enabled tools and build their LLM schemas in a single pass.
+        Creates tool instances from database models and binds them to this service. Does no I/O.
+
+        Args:
+            agent: Agent with integrations and enabled tools loaded
+            user_api_keys: User-provided API keys for LLM providers
+            llm_tool_providers: Provider per LLM tool model (from _resolve_llm_tool_providers)
+
+        Returns:
+            Tool schemas to send to the LLM (shared between turns - treat as read-only)
+        """
+        tools = [tool for integration in agent.integrations for tool in integration.tools]
+
+        # Schemas only change when a tool is edited, enabled or disabled, so they are reused
+        # across turns. Returning the same list also lets providers reuse their converted tools.
+        schemas_key = tuple((tool.id, tool.updated_at) for tool in tools)
+        tool_schemas = _tool_schemas_cache.get(schemas_key)
+        build_schemas = tool_schemas is None
+        if build_schemas:
+            tool_schemas = []
+
+        # We use tool schema name as the registry key; disabled tools are filtered in _load_agent
+        for tool in tools:
+            tool_schema = tool.tool_schema
+
+            if build_schemas:
+                # Build schema dynamically - description comes from tool.description, not tool_schema
+                schema = {
+                    "name": tool_schema.get("name", tool.name),
+                    "description": tool.description or tool_schema.get("description", ""),
+                    "input_schema": tool_schema.get("input_schema", {"type": "object", "properties": {}}),
+                }
+                tool_schemas.append(schema)
+                logger.debug("Adding tool schema for LLM: %s -> %s", tool.name, schema)
+
+            # Get API key for LLM tools
+            api_key = None
+            if tool.tool_type == "llm":
+                # Determine provider from the tool's model, not the agent's
+                provider_type = llm_tool_providers[tool.config.get("llm_model", "")]
+                api_key = self._get_api_key(provider_type, user_api_keys)
+
+            # Create tool instance
+            tool_instance = ToolFactory.create_tool(
+                tool,
+                api_key=api_key,
+                session=self.session,
+                user_id=agent.user_id,
+                organization_id=agent.organization_id,
+            )
+
+            # Bind to this conversation
+            self._tools[tool_schema.get("name", str(tool.id))] = tool_instance
+
+        if build_schemas:
+            if len(_tool_schemas_cache) >= _TOOL_SCHEMAS_CACHE_SIZE:
+                # Evict the oldest entry (dicts preserve insertion order)
+                _tool_schemas_cache.pop(next(iter(_tool_schemas_cache)))
+            _tool_schemas_cache[schemas_key] = tool_schemas
 
         return tool_schemas
 
-    async def _register_agent_tools(self, agent: Agent, user_api_keys: dict[str, str] | None = None):
+    async def _maybe_summarize(
+        self,
+        conversation: Conversation,
+        history: list[dict[str, Any]],
+        summary_content: str | None,
+        summarized_count: int,
+        history_start: int,
+        provider: BaseLLMProvider,
+        model: str | None,
+    ) -> str | None:
         """
-        Register all enabled tools for the agent in the tool registry.
-        Creates tool instances from database models and registers them.
+        Replace the oldest history messages with a summary when nearing the context budget.
+
+        Tokens are estimated at 4 characters each. The most recent messages are kept verbatim,
+        starting at a user message, and the rest is summarized together with any previous
+        summary and any messages between the summary and history (left out by the history
+        limit). The summary is stored on the conversation so later turns skip those messages.
+
+        Args:
+            conversation: Conversation being executed
+            history: Messages after the stored summary, trimmed in place when summarizing
+            summary_content: Previously stored summary, if any
+            summarized_count: Number of leading messages the stored summary covers
+            history_start: Number of messages before history (summarized or past the history limit)
+            provider: LLM provider used to write the summary
+            model: Model used to write the summary
+
+        Returns:
+            Summary covering the messages before history, or None if there is none
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        from app.tools.factory import ToolFactory
-
-        # Clear any existing tools for this agent (in case of re-registration)
-        # We use tool schema name as the registry key
-        for integration in agent.integrations:
-            for tool in integration.tools:
-                if tool.is_enabled:
-                    # Get tool name from schema
-                    tool_name = tool.tool_schema.get("name", str(tool.id))
-                    logger.info(f"Registering tool: {tool_name}, schema={tool.tool_schema}")
-
-                    # Get API key for LLM tools
-                    api_key = None
-                    if tool.tool_type == "llm":
-                        # Determine provider from the tool's model, not the agent's
-                        tool_model = tool.config.get("llm_model", "")
-                        provider_type = await self.llm_model_service.get_provider_for_model(tool_model)
-                        api_key = self._get_api_key(provider_type, user_api_keys)
-
-                    # Create tool instance
-                    tool_instance = ToolFactory.create_tool(
-                        tool,
-                        api_key=api_key,
-                        session=self.session,
-                        user_id=agent.user_id,
-                        organization_id=agent.organization_id,
-                    )
+        context_tokens = settings.conversation_context_tokens
+        if context_tokens <= 0:
+            return summary_content
+
+        estimated_chars = len(summary_content or "") + sum(len(m["content"]) for m in history)
+        if estimated_chars // 4 <= context_tokens * 0.8:
+            return summary_content
+
+        split = len(history) - settings.conversation_keep_recent_messages
+        while split > 0 and history[split]["role"] != "user":
+            split -= 1
+        if split <= 0:
+            return summary_content
+
+        # Messages past the history limit but not yet summarized would otherwise be skipped
+        # for good once the summary advances past them
+        skipped = []
+        if history_start > summarized_count:
+            skipped = await self.conversation_service.get_conversation_history(
+                conversation.id, limit=history_start - summarized_count, offset=summarized_count
+            )
 
-                    # Register in registry
-                    self.tool_registry.register(tool_name, tool_instance)
+        transcript = "\n\n".join(
+            f"{m['role']}: {m['content']}" for m in [*skipped, *history[:split]]
+        )
+        if summary_content:
+            transcript = f"Summary so far:\n{summary_content}\n\n{transcript}"
+
+        try:
+            new_summary = await provider.generate_without_tools(
+                model=model,
+                prompt=transcript,
+                system=_SUMMARY_INSTRUCTIONS,
+                temperature=0,
+                max_tokens=1024,
+            )
+        except Exception as e:
+            # Sending the full history is better than failing the turn
+            logger.warning("Conversation summarization failed: %s", e)
+            return summary_content
+
+        await self.conversation_service.save_summary(
+            conversation, new_summary, history_start + split
+        )
+        del history[:split]
+        return new_summary
+
+    @staticmethod
+    def _format_tool_result_content(tool_use: dict[str, Any], footer: str) -> str:
+        """Render a tool result as text for the LLM, followed by the shared progress footer."""
+        tool_result = tool_use["result"]
+        if isinstance(tool_result, dict) and not tool_result.get("success", True):
+            result_str = tool_result.get("error", str(tool_result))
+        else:
+            result_str = str(tool_result.get("result", tool_result))
+        return result_str + footer
+
+    @staticmethod
+    def _append_anthropic_round(
+        conversation_messages: list[dict[str, Any]],
+        assistant_content: str,
+        tool_uses: list[dict[str, Any]],
+        footer: str,
+    ) -> None:
+        """Append an Anthropic tool round: assistant tool_use blocks + user tool_result blocks."""
+        assistant_message_content = []
+        if assistant_content:
+            assistant_message_content.append({"type": "text", "text": assistant_content})
+
+        for tool_use in tool_uses:
+            assistant_message_content.append({
+                "type": "tool_use",
+                "id": tool_use["id"],
+                "name": tool_use["name"],
+                "input": tool_use["input"],
+            })
+
+        conversation_messages.append({
+            "role": "assistant",
+            "content": assistant_message_content,
+        })
+
+        conversation_messages.append({
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": tool_use["id"],
+                    "content": AgentExecutionService._format_tool_result_content(tool_use, footer),
+                }
+                for tool_use in tool_uses
+            ],
+        })
+
+    @staticmethod
+    def _append_openai_round(
+        conversation_messages: list[dict[str, Any]],
+        assistant_content: str,
+        tool_uses: list[dict[str, Any]],
+        footer: str,
+    ) -> None:
+        """Append an OpenAI/Google tool round: assistant tool_calls + one tool message per result."""
+        conversation_messages.append({
+            "role": "assistant",
+            "tool_calls": [
+                {
+                    "id": tool_use["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tool_use["name"],
+                        # Reuse the JSON the provider streamed instead of re-encoding it
+                        "arguments": tool_use.get("input_json") or json.dumps(tool_use["input"]),
+                    },
+                }
+                for tool_use in tool_uses
+            ],
+            "content": assistant_content or None,
+        })
+
+        for tool_use in tool_uses:
+            conversation_messages.append({
+                "role": "tool",
+                "tool_call_id": tool_use["id"],
+                "content": AgentExecutionService._format_tool_result_content(tool_use, footer),
+            })
+
+    # Message shape per provider; anything not listed uses the OpenAI format
+    _TOOL_ROUND_BUILDERS = {"anthropic": _append_anthropic_round}
+
+    def _get_tool_round_builder(
+        self, provider_type: str
+    ) -> Callable[[list[dict[str, Any]], str, list[dict[str, Any]], str], None]:
+        """Get the function that appends a tool round in the provider's message format."""
+        return self._TOOL_ROUND_BUILDERS.get(provider_type, self._append_openai_round)
+
+    async def _execute_tool_calls(
+        self, tool_uses: list[dict[str, Any]]
+    ) -> AsyncIterator[tuple[int, dict[str, Any], int]]:
+        """
+        Execute the tool calls from one LLM turn.
+
+        Calls run concurrently when every tool involved is parallel-safe, otherwise
+        sequentially in the order the LLM requested them.
+
+        Yields:
+            (index, result, duration_ms) for each tool use, as each one finishes
+        """
+        if len(tool_uses) > 1 and all(
+            self._is_parallel_safe(tool_use["name"]) for tool_use in tool_uses
+        ):
+            tasks = [
+                asyncio.create_task(self._execute_indexed_tool(index, tool_use))
+                for index, tool_use in enumerate(tool_uses)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                # Don't leave calls running if the consumer stops early
+                for task in tasks:
+                    task.cancel()
+            return
+
+        for index, tool_use in enumerate(tool_uses):
+            yield await self._execute_indexed_tool(index, tool_use)
+
+    async def _execute_indexed_tool(
+        self, index: int, tool_use: dict[str, Any]
+    ) -> tuple[int, dict[str, Any], int]:
+        """Execute a tool use, tagging its result with its position in the turn."""
+        tool_result, duration_ms = await self._execute_timed_tool(tool_use["name"], tool_use["input"])
+        return index, tool_result, duration_ms
+
+    def _is_parallel_safe(self, tool_name: str) -> bool:
+        """Whether a tool may run concurrently with others (unknown tools fail fast, so yes)."""
+        tool = self._tools.get(tool_name)
+        return tool is None or tool.parallel_safe
+
+    async def _execute_timed_tool(
+        self, tool_name: str, tool_input: dict[str, Any]
+    ) -> tuple[dict[str, Any], int]:
+        """Execute a tool by name, returning its result and duration in milliseconds."""
+        start_ns = time.perf_counter_ns()
+        tool_result = await self._execute_tool(tool_name, tool_input)
+        return tool_result, (time.perf_counter_ns() - start_ns) // 1_000_000
 
     async def _execute_tool(self, tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
         """Execute a tool by name."""
-        tool = self.tool_registry.get(tool_name)
+        tool = self._tools.get(tool_name)
 
         if not tool:
             return {"success": False, "error": f"Tool {tool_name} not found"}
 
         try:
+            input_error = tool.get_input_error(tool_input)
+            if input_error:
+                return {"success": False, "error": f"Invalid input for {tool_name}: {input_error}"}
+
             result = await tool.execute(tool_input)
             return result
         except Exception as e:
@@ -577,66 +1033,13 @@ class AgentExecutionService:
 
     def _get_api_key(self, provider_type: str, user_api_keys: dict[str, str] | None) -> str:
         """Get API key for provider (user-provided or system default)."""
-        from app.config import settings
-
-        if user_api_keys and provider_type in user_api_keys:
-            return user_api_keys[provider_type]
+        user_api_key = (user_api_keys or {}).get(provider_type)
+        if user_api_key:
+            return user_api_key
 
         # Fallback to system keys
-        if provider_type == "anthropic":
-            return settings.anthropic_api_key or ""
-        elif provider_type == "openai":
-            return settings.openai_api_key or ""
-        elif provider_type == "google":
-            return settings.google_api_key or ""
-
-        raise ValueError(f"No API key found for provider: {provider_type}")
-
-    def _build_enhanced_system_prompt(self, base_instructions: str, tool_schemas: list[dict[str, Any]]) -> str:
-        """
-        Build enhanced system prompt that includes default behavioral instructions and tool descriptions.
-
-        Structure:
-        1. User's custom instructions (from agent.instructions)
-        2. Default behavioral instructions (auto-added at runtime)
-        3. Available tools (auto-added at runtime)
-        """
-        from app.services.agent_defaults import get_default_agent_instructions
-
-        # Start with user's custom instructions
-        enhanced_prompt = base_instructions
-
-        # Append default behavioral instructions
-        default_instructions = get_default_agent_instructions()
-        enhanced_prompt += f"\n\n{default_instructions}"
-
-        # Append tools section if tools are available
-        if not tool_schemas:
-            return enhanced_prompt
-
-        tools_section = "\n\n# Available Tools\n\nYou have access to the following tools:\n\n"
-
-        for tool_schema in tool_schemas:
-            tool_name = tool_schema.get("name", "unknown")
-            tool_description = tool_schema.get("description", "No description")
-            input_schema = tool_schema.get("input_schema", {})
-            properties = input_schema.get("properties", {})
-            required_fields = input_schema.get("required", [])
-
-            tools_section += f"## {tool_name}\n"
-            tools_section += f"{tool_description}\n\n"
-
-            if properties:
-                tools_section += "**Parameters:**\n"
-                for param_name, param_info in properties.items():
-                    param_type = param_info.get("type", "string")
-                    param_desc = param_info.get("description", "")
-                    is_required = param_name in required_fields
-                    required_marker = " (REQUIRED)" if is_required else " (optional)"
-
-                    tools_section += f"- `{param_name}` ({param_type}){required_marker}: {param_desc}\n"
-                tools_section += "\n"
-            else:
-                tools_section += "No parameters required.\n\n"
+        system_key_getter = _SYSTEM_API_KEY_GETTERS.get(provider_type)
+        if system_key_getter is None:
+            raise ValueError(f"No API key found for provider: {provider_type}")
 
-        return enhanced_prompt + tools_section
+        return system_key_getter(settings) or ""
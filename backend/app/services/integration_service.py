@@ -1,15 +1,22 @@
 """Integration service for managing integrations."""
 
 import uuid
-from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.integration import Integration
 from app.models.agent import Agent
 
+# Built once; the agent ID is bound per call
+_AGENT_INTEGRATIONS_QUERY = (
+    select(Integration)
+    .options(selectinload(Integration.tools))
+    .where(Integration.agent_id == bindparam("agent_id"))
+    .order_by(Integration.created_at.desc())
+)
+
 
 class IntegrationService:
     """Service for managing integrations."""
@@ -61,12 +68,7 @@ class IntegrationService:
 
     async def get_agent_integrations(self, agent_id: uuid.UUID) -> list[Integration]:
         """Get all integrations for an agent."""
-        result = await self.session.execute(
-            select(Integration)
-            .options(selectinload(Integration.tools))
-            .where(Integration.agent_id == agent_id)
-            .order_by(Integration.created_at.desc())
-        )
+        result = await self.session.execute(_AGENT_INTEGRATIONS_QUERY, {"agent_id": agent_id})
         return list(result.scalars().all())
 
     async def update_integration(
@@ -88,9 +90,8 @@ class IntegrationService:
         if config is not None:
             integration.config = config
 
-        integration.updated_at = datetime.utcnow()
+        # updated_at is set by the column's onupdate, and tools were loaded by get_integration
         await self.session.flush()
-        await self.session.refresh(integration, ["tools"])
 
         return integration
 
@@ -1,12 +1,74 @@
 """LLM model service for querying model configurations."""
 
-from functools import lru_cache
+import time
+from functools import cache
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.llm_model import LLMModel
 
+# Statements are built once; per-call values are bound as parameters
+_PROVIDER_FOR_MODEL_QUERY = select(LLMModel.provider).where(
+    LLMModel.model_id == bindparam("model_id"),
+    LLMModel.is_active == True  # noqa: E712
+)
+_PROVIDERS_FOR_MODELS_QUERY = select(LLMModel.model_id, LLMModel.provider).where(
+    LLMModel.model_id.in_(bindparam("model_ids", expanding=True)),
+    LLMModel.is_active == True  # noqa: E712
+)
+_ALL_MODELS_QUERY = (
+    select(LLMModel)
+    .where(LLMModel.is_active == True)  # noqa: E712
+    .order_by(LLMModel.provider, LLMModel.display_name)
+)
+_MODELS_BY_PROVIDER_QUERY = (
+    select(LLMModel)
+    .where(
+        LLMModel.provider == bindparam("provider"),
+        LLMModel.is_active == True  # noqa: E712
+    )
+    .order_by(LLMModel.display_name)
+)
+
+# Model name prefixes per provider, for models missing from the llm_models table
+_PROVIDER_PREFIXES = (
+    ("claude", "anthropic"),
+    ("gpt", "openai"),
+    ("chatgpt-", "openai"),
+    ("ft:", "openai"),  # Fine-tuned models, e.g. "ft:gpt-4o-mini:org::id"
+    ("o1", "openai"),
+    ("gemini", "google"),
+)
+
+
+# Model ID -> (expires at, provider). Models change rarely (only through migrations), so
+# routing lookups are served from memory for llm_model_cache_ttl_seconds.
+_provider_cache: dict[str, tuple[float, str]] = {}
+_PROVIDER_CACHE_SIZE = 1024
+
+
+def _get_cached_provider(model_id: str) -> str | None:
+    """Return the cached provider for a model ID, or None if missing or expired."""
+    entry = _provider_cache.get(model_id)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _cache_provider(model_id: str, provider: str) -> None:
+    """Cache the provider for a model ID, evicting the oldest entry when full."""
+    ttl_seconds = settings.llm_model_cache_ttl_seconds
+    if ttl_seconds <= 0:
+        return
+
+    if model_id not in _provider_cache and len(_provider_cache) >= _PROVIDER_CACHE_SIZE:
+        # Dicts preserve insertion order, so the first key is the oldest
+        _provider_cache.pop(next(iter(_provider_cache)))
+
+    _provider_cache[model_id] = (time.monotonic() + ttl_seconds, provider)
+
 
 class LLMModelService:
     """Service for managing LLM model configurations."""
@@ -27,49 +89,77 @@ class LLMModelService:
         Raises:
             ValueError: If model not found
         """
+        provider = _get_cached_provider(model_id)
+        if provider is not None:
+            return provider
+
         # Query database
-        query = select(LLMModel).where(
-            LLMModel.model_id == model_id,
-            LLMModel.is_active == True  # noqa: E712
-        )
-        result = await self.session.execute(query)
-        model = result.scalar_one_or_none()
+        result = await self.session.execute(_PROVIDER_FOR_MODEL_QUERY, {"model_id": model_id})
+        provider = result.scalar_one_or_none()
 
-        if not model:
+        if not provider:
             # Fallback to heuristic for unknown models
-            return self._fallback_provider_detection(model_id)
+            provider = self._fallback_provider_detection(model_id)
 
-        return model.provider
+        _cache_provider(model_id, provider)
+        return provider
+
+    async def get_providers_for_models(self, model_ids: set[str]) -> dict[str, str]:
+        """
+        Get providers for several model IDs with at most one query.
+
+        Args:
+            model_ids: Model identifiers to look up
+
+        Returns:
+            Mapping of model ID to provider name, using the heuristic for unknown models
+        """
+        providers = {}
+        uncached_ids = []
+        for model_id in model_ids:
+            provider = _get_cached_provider(model_id)
+            if provider is None:
+                uncached_ids.append(model_id)
+            else:
+                providers[model_id] = provider
+
+        if not uncached_ids:
+            return providers
+
+        result = await self.session.execute(
+            _PROVIDERS_FOR_MODELS_QUERY, {"model_ids": uncached_ids}
+        )
+        providers.update(result.tuples().all())
+
+        for model_id in uncached_ids:
+            if model_id not in providers:
+                # Fallback to heuristic for unknown models
+                providers[model_id] = self._fallback_provider_detection(model_id)
+            _cache_provider(model_id, providers[model_id])
+
+        return providers
 
     async def get_all_models(self) -> list[LLMModel]:
         """Get all active LLM models."""
-        query = select(LLMModel).where(LLMModel.is_active == True).order_by(LLMModel.provider, LLMModel.display_name)  # noqa: E712
-        result = await self.session.execute(query)
+        result = await self.session.execute(_ALL_MODELS_QUERY)
         return list(result.scalars().all())
 
     async def get_models_by_provider(self, provider: str) -> list[LLMModel]:
         """Get all active models for a specific provider."""
-        query = select(LLMModel).where(
-            LLMModel.provider == provider,
-            LLMModel.is_active == True  # noqa: E712
-        ).order_by(LLMModel.display_name)
-        result = await self.session.execute(query)
+        result = await self.session.execute(_MODELS_BY_PROVIDER_QUERY, {"provider": provider})
         return list(result.scalars().all())
 
     @staticmethod
-    @lru_cache(maxsize=128)
+    @cache
     def _fallback_provider_detection(model_id: str) -> str:
         """
         Fallback heuristic for unknown models.
-        Uses string matching as backup.
+        Matches the model name (after any "namespace/" part) against known prefixes.
         """
-        model_lower = model_id.lower()
-        if "claude" in model_lower:
-            return "anthropic"
-        elif "gpt" in model_lower or "o1" in model_lower:
-            return "openai"
-        elif "gemini" in model_lower:
-            return "google"
-        else:
-            # Default to anthropic
-            return "anthropic"
+        model_name = model_id.rpartition("/")[2].lower()
+        for prefix, provider in _PROVIDER_PREFIXES:
+            if model_name.startswith(prefix):
+                return provider
+
+        # Default to anthropic
+        return "anthropic"
@@ -1,18 +1,124 @@
 """OAuth 2.0 authorization flow service."""
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import struct
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from urllib.parse import urlencode
 
-import httpx
-from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.integration import Integration
 from app.services.credential_service import CredentialService
-from app.tools.platforms import get_platform
+from app.tools.platforms import PLATFORMS, get_platform
+from app.utils.http_client import get_http_client
+
+# Token requests send a pre-encoded form body (httpx adds Content-Length for bytes content)
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Platform ID -> (client ID, client secret), resolved from settings once at import
+_OAUTH_CLIENTS: dict[str, tuple[str | None, str | None]] = {
+    platform_id: (
+        getattr(settings, platform.oauth_config.client_id_env.lower(), None),
+        getattr(settings, platform.oauth_config.client_secret_env.lower(), None),
+    )
+    for platform_id, platform in PLATFORMS.items()
+    if platform.oauth_config
+}
+
+# Integration ID -> pending refresh. Concurrent callers that find an expired token share
+# the first caller's refresh instead of each posting the refresh token to the provider.
+_refresh_inflight: dict[uuid.UUID, asyncio.Future[str]] = {}
+
+
+@lru_cache(maxsize=256)
+def _build_auth_url_prefix(platform_id: str, base_url: str) -> str:
+    """
+    Build a platform's authorization URL with every parameter except the state.
+
+    Args:
+        platform_id: Platform identifier (must support OAuth and have a client ID)
+        base_url: Base URL for building redirect URI
+
+    Returns:
+        Authorization URL, ready for "&state=..." to be appended
+    """
+    oauth_config = get_platform(platform_id).oauth_config
+    client_id, _ = _OAUTH_CLIENTS[platform_id]
+
+    params = {
+        "client_id": client_id,
+        "redirect_uri": oauth_config.get_redirect_uri(base_url),
+        "response_type": "code",
+    }
+
+    # Add scopes if defined
+    if oauth_config.scopes:
+        params["scope"] = " ".join(oauth_config.scopes)
+
+    return f"{oauth_config.authorize_url}?{urlencode(params)}"
+
+# OAuth state tokens are compact signed binary rather than JWTs: the payload is fixed, so
+# there is no JSON or header to parse, and verification is a single HMAC comparison.
+# The prefix keeps these MACs distinct from anything else signed with the secret key.
+_STATE_KEY = settings.secret_key.encode()
+_STATE_MAC_PREFIX = b"oauth-state:"
+_STATE_MAC_SIZE = hashlib.sha256().digest_size
+# Integration ID (16 bytes) + expiry (uint32 POSIX time); the platform ID follows
+_STATE_HEADER_SIZE = 20
+
+
+def _encode_state(integration_id: uuid.UUID, platform_id: str) -> str:
+    """
+    Create a signed, self-expiring OAuth state token.
+
+    Args:
+        integration_id: Integration ID to associate with this OAuth flow
+        platform_id: Platform identifier
+
+    Returns:
+        URL-safe state token
+    """
+    expires_at = int(time.time()) + settings.oauth_state_expiry_seconds
+    payload = integration_id.bytes + struct.pack(">I", expires_at) + platform_id.encode()
+    mac = hmac.new(_STATE_KEY, _STATE_MAC_PREFIX + payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(payload + mac).rstrip(b"=").decode()
+
+
+def _decode_state(state: str) -> tuple[uuid.UUID, str]:
+    """
+    Verify and decode an OAuth state token.
+
+    Args:
+        state: State token created by _encode_state
+
+    Returns:
+        Tuple of (integration ID, platform ID)
+
+    Raises:
+        ValueError: If the token is malformed, tampered with, or expired
+    """
+    try:
+        raw = base64.urlsafe_b64decode(state + "=" * (-len(state) % 4))
+    except ValueError:
+        raise ValueError("malformed token") from None
+
+    payload, mac = raw[:-_STATE_MAC_SIZE], raw[-_STATE_MAC_SIZE:]
+    expected = hmac.new(_STATE_KEY, _STATE_MAC_PREFIX + payload, hashlib.sha256).digest()
+    if len(payload) < _STATE_HEADER_SIZE or not hmac.compare_digest(mac, expected):
+        raise ValueError("signature verification failed")
+
+    (expires_at,) = struct.unpack_from(">I", payload, 16)
+    if expires_at <= time.time():
+        raise ValueError("token has expired")
+
+    return uuid.UUID(bytes=payload[:16]), payload[_STATE_HEADER_SIZE:].decode()
 
 
 class OAuthService:
@@ -56,38 +162,18 @@ class OAuthService:
         oauth_config = platform.oauth_config
 
         # Get client ID from settings
-        client_id = getattr(settings, oauth_config.client_id_env.lower(), None)
+        client_id, _ = _OAUTH_CLIENTS[platform_id]
         if not client_id:
             raise ValueError(
                 f"OAuth client ID not configured. Set {oauth_config.client_id_env} environment variable"
             )
 
-        # Generate stateless JWT state token (no Redis needed)
+        # Generate stateless state token (no Redis needed)
         # The state contains the integration_id and expiry, signed with our secret key
-        state_payload = {
-            "integration_id": str(integration_id),
-            "platform_id": platform_id,
-            "exp": datetime.now(timezone.utc) + timedelta(seconds=settings.oauth_state_expiry_seconds),
-        }
-        state = jwt.encode(state_payload, settings.secret_key, algorithm=settings.algorithm)
-
-        # Build redirect URI
-        redirect_uri = oauth_config.get_redirect_uri(base_url)
-
-        # Build authorization URL
-        params = {
-            "client_id": client_id,
-            "redirect_uri": redirect_uri,
-            "response_type": "code",
-            "state": state,
-        }
-
-        # Add scopes if defined
-        if oauth_config.scopes:
-            params["scope"] = " ".join(oauth_config.scopes)
-
-        auth_url = f"{oauth_config.authorize_url}?{urlencode(params)}"
-        return auth_url
+        state = _encode_state(integration_id, platform_id)
+
+        # Build authorization URL (only the state differs between calls)
+        return f"{_build_auth_url_prefix(platform_id, base_url)}&{urlencode({'state': state})}"
 
     async def handle_callback(
         self,
@@ -109,23 +195,17 @@ class OAuthService:
         Raises:
             ValueError: If state invalid, platform not found, or token exchange fails
         """
-        # Validate state by decoding the JWT (stateless - no Redis needed)
+        # Validate state by verifying its signature (stateless - no Redis needed)
         try:
-            state_payload = jwt.decode(
-                state,
-                settings.secret_key,
-                algorithms=[settings.algorithm],
-            )
-            integration_id = uuid.UUID(state_payload["integration_id"])
-
-            # Verify platform_id matches
-            if state_payload.get("platform_id") != platform_id:
-                raise ValueError("Platform mismatch in OAuth state")
-
-        except JWTError as e:
+            integration_id, state_platform_id = _decode_state(state)
+        except ValueError as e:
             raise ValueError(f"Invalid or expired OAuth state parameter: {e}")
 
-        # No need to delete state - JWT is stateless and self-expiring
+        # Verify platform_id matches
+        if state_platform_id != platform_id:
+            raise ValueError("Platform mismatch in OAuth state")
+
+        # No need to delete state - it is stateless and self-expiring
 
         # Get platform config
         platform = get_platform(platform_id)
@@ -135,8 +215,7 @@ class OAuthService:
         oauth_config = platform.oauth_config
 
         # Get client credentials from settings
-        client_id = getattr(settings, oauth_config.client_id_env.lower(), None)
-        client_secret = getattr(settings, oauth_config.client_secret_env.lower(), None)
+        client_id, client_secret = _OAUTH_CLIENTS[platform_id]
 
         if not client_id or not client_secret:
             raise ValueError(
@@ -144,26 +223,25 @@ class OAuthService:
                 f"and {oauth_config.client_secret_env} environment variables"
             )
 
-        # Exchange code for tokens
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                oauth_config.token_url,
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "redirect_uri": oauth_config.get_redirect_uri(
-                        settings.frontend_url  # Must match the authorization redirect_uri
-                    ),
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        # Exchange code for tokens (over the shared, kept-alive client)
+        response = await get_http_client().post(
+            oauth_config.token_url,
+            content=urlencode({
+                "grant_type": "authorization_code",
+                "code": code,
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "redirect_uri": oauth_config.get_redirect_uri(
+                    settings.frontend_url  # Must match the authorization redirect_uri
+                ),
+            }).encode(),
+            headers=_FORM_HEADERS,
+        )
 
-            if response.status_code != 200:
-                raise ValueError(f"Token exchange failed: {response.text}")
+        if response.status_code != 200:
+            raise ValueError(f"Token exchange failed: {response.text}")
 
-            token_data = response.json()
+        token_data = response.json()
 
         # Extract tokens
         access_token = token_data.get("access_token")
@@ -199,16 +277,25 @@ class OAuthService:
             integration.config["nickname"] = token_data["nickname"]
 
         await self.session.commit()
-        await self.session.refresh(integration)
 
         return integration
 
-    async def refresh_token(self, integration_id: uuid.UUID) -> str:
+    async def refresh_token(
+        self, integration_id: uuid.UUID, rejected_token: str | None = None
+    ) -> str:
         """
         Refresh access token using refresh token.
 
+        Only one refresh per integration is in flight at a time; concurrent
+        callers wait for it and receive the same new access token. A caller
+        arriving after a refresh finished gets the stored token instead of
+        refreshing again, if it is still valid.
+
         Args:
             integration_id: Integration ID
+            rejected_token: Access token the provider just rejected (e.g. with a 401).
+                If given, the stored token counts as valid only when it differs from
+                this one; otherwise it is valid until it expires.
 
         Returns:
             New access token
@@ -216,6 +303,54 @@ class OAuthService:
         Raises:
             ValueError: If refresh fails
         """
+        while (pending := _refresh_inflight.get(integration_id)) is not None:
+            try:
+                # Shield so a cancelled waiter does not cancel the shared refresh
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller running the refresh was cancelled; try again, possibly
+                # running it ourselves
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        # Mark the outcome as retrieved even if nobody else was waiting for it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        _refresh_inflight[integration_id] = future
+        try:
+            access_token = await self._get_valid_token(integration_id, rejected_token)
+            if access_token is None:
+                access_token = await self._exchange_refresh_token(integration_id)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(access_token)
+            return access_token
+        finally:
+            del _refresh_inflight[integration_id]
+
+    async def _get_valid_token(
+        self, integration_id: uuid.UUID, rejected_token: str | None
+    ) -> str | None:
+        """Return the stored access token if it was refreshed meanwhile, else None."""
+        credential = await self.credential_service.get_credentials(integration_id)
+        if not credential:
+            return None
+
+        if rejected_token is None:
+            if await self.credential_service.is_token_expired(credential):
+                return None
+            return await self.credential_service.decrypt_token(credential)
+
+        access_token = await self.credential_service.decrypt_token(credential)
+        return access_token if access_token != rejected_token else None
+
+    async def _exchange_refresh_token(self, integration_id: uuid.UUID) -> str:
+        """Exchange the stored refresh token for a new access token and store it."""
         # Get credentials
         credential = await self.credential_service.get_credentials(integration_id)
         if not credential:
@@ -240,32 +375,28 @@ class OAuthService:
         if not platform.oauth_config:
             raise ValueError(f"Platform {integration.platform_id} does not support OAuth")
 
-        oauth_config = platform.oauth_config
-
         # Get client credentials from settings
-        client_id = getattr(settings, oauth_config.client_id_env.lower(), None)
-        client_secret = getattr(settings, oauth_config.client_secret_env.lower(), None)
+        client_id, client_secret = _OAUTH_CLIENTS[integration.platform_id]
 
         if not client_id or not client_secret:
             raise ValueError("OAuth credentials not configured")
 
-        # Request new token
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                credential.oauth_token_url,
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        # Request new token (over the shared, kept-alive client)
+        response = await get_http_client().post(
+            credential.oauth_token_url,
+            content=urlencode({
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": client_id,
+                "client_secret": client_secret,
+            }).encode(),
+            headers=_FORM_HEADERS,
+        )
 
-            if response.status_code != 200:
-                raise ValueError(f"Token refresh failed: {response.text}")
+        if response.status_code != 200:
+            raise ValueError(f"Token refresh failed: {response.text}")
 
-            token_data = response.json()
+        token_data = response.json()
 
         # Extract new tokens
         new_access_token = token_data.get("access_token")
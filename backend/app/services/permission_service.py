@@ -4,13 +4,18 @@ import secrets
 import string
 import uuid
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.agent import Agent
 from app.models.agent_permission import AgentPermission
 from app.models.user import User
 
+# Share codes are drawn from 36^8 values; collisions are rare, so one batch almost always suffices
+_SHARE_CODE_ALPHABET = string.ascii_lowercase + string.digits
+_SHARE_CODE_BATCH_SIZE = 8
+
 
 class PermissionService:
     """Service for managing agent permissions and sharing."""
@@ -47,18 +52,21 @@ class PermissionService:
         if permission_type not in (self.PERMISSION_USE, self.PERMISSION_ADMIN):
             raise ValueError(f"Invalid permission type: {permission_type}")
 
+        # Load the granter's and the grantee's permissions in one query
+        permissions = await self._get_permissions_bulk(agent_id, [granted_by, user_id])
+
         # Check if granter has admin permission
-        if not await self.is_admin(agent_id, granted_by):
+        granter = permissions.get(granted_by)
+        if not granter or granter.permission_type != self.PERMISSION_ADMIN:
             raise ValueError("Only admins can grant permissions")
 
         # Check if permission already exists
-        existing = await self.get_permission(agent_id, user_id)
+        existing = permissions.get(user_id)
         if existing:
             # Update existing permission
             existing.permission_type = permission_type
             existing.granted_by = granted_by
             await self.session.commit()
-            await self.session.refresh(existing)
             return existing
 
         # Create new permission
@@ -70,9 +78,59 @@ class PermissionService:
         )
         self.session.add(permission)
         await self.session.commit()
-        await self.session.refresh(permission)
         return permission
 
+    async def grant_permissions_bulk(
+        self,
+        agent_id: uuid.UUID,
+        user_ids: list[uuid.UUID],
+        granted_by: uuid.UUID,
+        permission_type: str = PERMISSION_USE,
+    ) -> int:
+        """
+        Grant the same permission to several users for an agent in one statement.
+
+        Users who already have a permission on the agent keep it unchanged.
+
+        Args:
+            agent_id: ID of the agent
+            user_ids: IDs of the users to grant permission to
+            granted_by: ID of the user granting permission (must be admin)
+            permission_type: Type of permission ("use" or "admin")
+
+        Returns:
+            Number of permissions created
+
+        Raises:
+            ValueError: If permission_type is invalid or user doesn't have admin rights
+        """
+        if permission_type not in (self.PERMISSION_USE, self.PERMISSION_ADMIN):
+            raise ValueError(f"Invalid permission type: {permission_type}")
+
+        # Check if granter has admin permission
+        if not await self.is_admin(agent_id, granted_by):
+            raise ValueError("Only admins can grant permissions")
+
+        if not user_ids:
+            return 0
+
+        # Single INSERT for all rows; existing (agent_id, user_id) pairs are skipped
+        result = await self.session.execute(
+            pg_insert(AgentPermission)
+            .values([
+                {
+                    "agent_id": agent_id,
+                    "user_id": user_id,
+                    "granted_by": granted_by,
+                    "permission_type": permission_type,
+                }
+                for user_id in dict.fromkeys(user_ids)
+            ])
+            .on_conflict_do_nothing(index_elements=["agent_id", "user_id"])
+        )
+        await self.session.commit()
+        return result.rowcount
+
     async def revoke_permission(
         self, agent_id: uuid.UUID, user_id: uuid.UUID, revoked_by: uuid.UUID
     ) -> bool:
@@ -90,12 +148,16 @@ class PermissionService:
         Raises:
             ValueError: If user doesn't have admin rights or trying to remove last admin
         """
+        # Load the revoker's and the revoked user's permissions in one query
+        permissions = await self._get_permissions_bulk(agent_id, [revoked_by, user_id])
+
         # Check if revoker has admin permission
-        if not await self.is_admin(agent_id, revoked_by):
+        revoker = permissions.get(revoked_by)
+        if not revoker or revoker.permission_type != self.PERMISSION_ADMIN:
             raise ValueError("Only admins can revoke permissions")
 
         # Get the permission to revoke
-        permission = await self.get_permission(agent_id, user_id)
+        permission = permissions.get(user_id)
         if not permission:
             return False
 
@@ -123,6 +185,20 @@ class PermissionService:
         )
         return result.scalar_one_or_none()
 
+    async def _get_permissions_bulk(
+        self, agent_id: uuid.UUID, user_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, AgentPermission]:
+        """Get the permissions of several users on an agent, keyed by user ID."""
+        result = await self.session.execute(
+            select(AgentPermission).where(
+                and_(
+                    AgentPermission.agent_id == agent_id,
+                    AgentPermission.user_id.in_(user_ids),
+                )
+            )
+        )
+        return {permission.user_id: permission for permission in result.scalars()}
+
     async def has_permission(
         self, agent_id: uuid.UUID, user_id: uuid.UUID, required_type: str | None = None
     ) -> bool:
@@ -157,14 +233,16 @@ class PermissionService:
     async def count_admins(self, agent_id: uuid.UUID) -> int:
         """Count the number of admins for an agent."""
         result = await self.session.execute(
-            select(AgentPermission).where(
+            select(func.count())
+            .select_from(AgentPermission)
+            .where(
                 and_(
                     AgentPermission.agent_id == agent_id,
                     AgentPermission.permission_type == self.PERMISSION_ADMIN,
                 )
             )
         )
-        return len(result.scalars().all())
+        return result.scalar_one()
 
     async def list_agent_users(self, agent_id: uuid.UUID) -> list[dict]:
         """
@@ -172,37 +250,53 @@ class PermissionService:
 
         Returns list of dicts with user info and permission details.
         """
+        # Select only the listed columns; no ORM objects are needed to build the dicts
         result = await self.session.execute(
-            select(AgentPermission, User)
+            select(
+                User.id,
+                User.email,
+                User.full_name,
+                AgentPermission.permission_type,
+                AgentPermission.granted_at,
+                AgentPermission.granted_by,
+            )
             .join(User, AgentPermission.user_id == User.id)
             .where(AgentPermission.agent_id == agent_id)
             .order_by(
-                # Sort admins first, then by granted_at
+                # Sort admins first, then by granted_at (served by ix_agent_permissions_sort)
                 AgentPermission.permission_type.desc(),
                 AgentPermission.granted_at.desc(),
             )
         )
 
-        users = []
-        for permission, user in result:
-            users.append({
-                "user_id": str(user.id),
-                "email": user.email,
-                "full_name": user.full_name,
-                "permission_type": permission.permission_type,
-                "granted_at": permission.granted_at.isoformat(),
-                "granted_by": str(permission.granted_by),
-            })
-
-        return users
-
-    async def list_user_agents(self, user_id: uuid.UUID, permission_type: str | None = None) -> list[Agent]:
+        return [
+            {
+                "user_id": str(user_id),
+                "email": email,
+                "full_name": full_name,
+                "permission_type": permission_type,
+                "granted_at": granted_at.isoformat(),
+                "granted_by": str(granted_by),
+            }
+            for user_id, email, full_name, permission_type, granted_at, granted_by in result
+        ]
+
+    async def list_user_agents(
+        self,
+        user_id: uuid.UUID,
+        permission_type: str | None = None,
+        *,
+        load_integrations: bool = False,
+        load_tools: bool = False,
+    ) -> list[Agent]:
         """
         List all agents a user has access to.
 
         Args:
             user_id: ID of the user
             permission_type: Filter by permission type ("use" or "admin"). If None, return all.
+            load_integrations: Eager-load each agent's integrations
+            load_tools: Eager-load each agent's integrations and their tools
 
         Returns:
             List of agents
@@ -214,11 +308,14 @@ class PermissionService:
             select(Agent)
             .join(AgentPermission, Agent.id == AgentPermission.agent_id)
             .where(AgentPermission.user_id == user_id)
-            .options(
-                selectinload(Agent.integrations).selectinload(Integration.tools)
-            )
         )
 
+        # Only load the relationships the caller will read
+        if load_tools:
+            query = query.options(selectinload(Agent.integrations).selectinload(Integration.tools))
+        elif load_integrations:
+            query = query.options(selectinload(Agent.integrations))
+
         if permission_type:
             query = query.where(AgentPermission.permission_type == permission_type)
 
@@ -253,25 +350,26 @@ class PermissionService:
         if not agent:
             raise ValueError("Agent not found")
 
-        # Generate a unique share code
-        while True:
-            # Generate 8-character alphanumeric code
-            share_code = ''.join(
-                secrets.choice(string.ascii_lowercase + string.digits) for _ in range(8)
-            )
+        # Generate a unique share code, checking a batch of candidates per query
+        share_code = None
+        while share_code is None:
+            # Generate 8-character alphanumeric codes
+            candidates = [
+                ''.join(secrets.choice(_SHARE_CODE_ALPHABET) for _ in range(8))
+                for _ in range(_SHARE_CODE_BATCH_SIZE)
+            ]
 
-            # Check if code is unique
+            # Keep the first code no agent is using yet
             result = await self.session.execute(
-                select(Agent).where(Agent.share_code == share_code)
+                select(Agent.share_code).where(Agent.share_code.in_(candidates))
             )
-            if not result.scalar_one_or_none():
-                break
+            taken = set(result.scalars())
+            share_code = next((code for code in candidates if code not in taken), None)
 
         # Update agent with share code and mark as shareable
         agent.share_code = share_code
         agent.is_shareable = True
         await self.session.commit()
-        await self.session.refresh(agent)
 
         return share_code
 
@@ -292,22 +390,30 @@ class PermissionService:
         Raises:
             ValueError: If share code is invalid or expired
         """
-        # Find agent by share code
+        # Find agent by share code, along with the user's existing permission (if any)
         result = await self.session.execute(
-            select(Agent).where(
+            select(Agent, AgentPermission.id)
+            .outerjoin(
+                AgentPermission,
+                and_(
+                    AgentPermission.agent_id == Agent.id,
+                    AgentPermission.user_id == user_id,
+                ),
+            )
+            .where(
                 and_(
                     Agent.share_code == share_code,
                     Agent.is_shareable == True,
                 )
             )
         )
-        agent = result.scalar_one_or_none()
-        if not agent:
+        row = result.one_or_none()
+        if not row:
             raise ValueError("Invalid or expired share code")
+        agent, existing_permission_id = row
 
         # Check if user already has permission
-        existing = await self.get_permission(agent.id, user_id)
-        if existing:
+        if existing_permission_id:
             return agent
 
         # Grant permission (use agent owner as granter)
@@ -340,17 +446,14 @@ class PermissionService:
         if not await self.is_admin(agent_id, revoked_by):
             raise ValueError("Only admins can revoke share codes")
 
-        # Get the agent
+        # Clear share code in a single UPDATE (no need to load the agent)
         result = await self.session.execute(
-            select(Agent).where(Agent.id == agent_id)
+            update(Agent)
+            .where(Agent.id == agent_id)
+            .values(share_code=None, is_shareable=False)
         )
-        agent = result.scalar_one_or_none()
-        if not agent:
+        if not result.rowcount:
             raise ValueError("Agent not found")
-
-        # Clear share code
-        agent.share_code = None
-        agent.is_shareable = False
         await self.session.commit()
 
         return True
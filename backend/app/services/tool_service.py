@@ -1,13 +1,51 @@
 """Tool service for managing tools within integrations."""
 
+import copy
+import logging
 import uuid
-from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.tool import Tool
 from app.models.integration import Integration
+from app.tools.factory import ToolFactory
+
+logger = logging.getLogger(__name__)
+
+# (integration type, platform ID, tool name) -> schema. A platform tool's schema depends only
+# on its class, so each one is built once instead of instantiating the tool on every create.
+_platform_tool_schemas: dict[tuple[str, str, str], dict] = {}
+_PLATFORM_TOOL_SCHEMAS_SIZE = 512
+
+
+def _get_platform_tool_schema(integration: Integration, tool: Tool) -> dict:
+    """
+    Get the schema of a pre-built platform tool, building it on first use.
+
+    Args:
+        integration: Platform integration the tool belongs to
+        tool: Unsaved tool model with the tool's name and config
+
+    Returns:
+        Copy of the tool class's schema
+
+    Raises:
+        ValueError: If the platform or tool is not supported
+    """
+    key = (integration.type, integration.platform_id, tool.name.lower())
+    schema = _platform_tool_schemas.get(key)
+    if schema is None:
+        tool.integration = integration
+        schema = ToolFactory.create_tool(tool).get_schema()
+
+        if len(_platform_tool_schemas) >= _PLATFORM_TOOL_SCHEMAS_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order)
+            _platform_tool_schemas.pop(next(iter(_platform_tool_schemas)))
+        _platform_tool_schemas[key] = schema
+
+    # Each row gets its own copy so the cached schema is never mutated through a tool
+    return copy.deepcopy(schema)
 
 
 class ToolService:
@@ -27,11 +65,8 @@ class ToolService:
         is_enabled: bool = True,
     ) -> Tool:
         """Create a new tool."""
-        # Verify integration exists
-        result = await self.session.execute(
-            select(Integration).where(Integration.id == integration_id)
-        )
-        integration = result.scalar_one_or_none()
+        # Verify integration exists (served from the identity map if already loaded)
+        integration = await self.session.get(Integration, integration_id)
         if not integration:
             raise ValueError(f"Integration with ID {integration_id} not found")
 
@@ -41,8 +76,6 @@ class ToolService:
         final_tool_schema = tool_schema or {}
         if integration.platform_id and tool_type is None:
             # This is a pre-built platform tool - schema comes from tool class
-            from app.tools.factory import ToolFactory
-
             # Create a temporary tool model to get the schema
             temp_tool = Tool(
                 integration_id=integration_id,
@@ -53,17 +86,13 @@ class ToolService:
                 config=config or {},
                 is_enabled=is_enabled,
             )
-            temp_tool.integration = integration
 
             try:
-                # Instantiate the platform tool to get its schema
-                tool_instance = ToolFactory.create_tool(temp_tool)
-                final_tool_schema = tool_instance.get_schema()
+                # Instantiate the platform tool to get its schema (once per tool class)
+                final_tool_schema = _get_platform_tool_schema(integration, temp_tool)
             except Exception as e:
                 # If we can't get schema, log but continue with provided schema
-                import logging
-
-                logging.warning(f"Could not get schema for platform tool: {e}")
+                logger.warning(f"Could not get schema for platform tool: {e}")
                 # Fall back to provided schema if tool instantiation fails
                 final_tool_schema = tool_schema or {}
 
@@ -79,7 +108,6 @@ class ToolService:
 
         self.session.add(tool)
         await self.session.flush()
-        await self.session.refresh(tool)
 
         return tool
 
@@ -109,32 +137,32 @@ class ToolService:
         is_enabled: bool | None = None,
     ) -> Tool:
         """Update a tool."""
-        tool = await self.get_tool(tool_id)
+        values = {
+            field: value
+            for field, value in (
+                ("name", name),
+                ("description", description),
+                ("tool_schema", tool_schema),
+                ("config", config),
+                ("is_enabled", is_enabled),
+            )
+            if value is not None
+        }
+        if not values:
+            tool = await self.get_tool(tool_id)
+        else:
+            # Single UPDATE ... RETURNING instead of loading the tool first
+            result = await self.session.execute(
+                update(Tool).where(Tool.id == tool_id).values(**values).returning(Tool)
+            )
+            tool = result.scalar_one_or_none()
+
         if not tool:
             raise ValueError(f"Tool with ID {tool_id} not found")
-
-        if name is not None:
-            tool.name = name
-        if description is not None:
-            tool.description = description
-        if tool_schema is not None:
-            tool.tool_schema = tool_schema
-        if config is not None:
-            tool.config = config
-        if is_enabled is not None:
-            tool.is_enabled = is_enabled
-
-        tool.updated_at = datetime.utcnow()
-        await self.session.flush()
-        await self.session.refresh(tool)
-
         return tool
 
     async def delete_tool(self, tool_id: uuid.UUID) -> None:
         """Delete a tool."""
-        tool = await self.get_tool(tool_id)
-        if not tool:
+        result = await self.session.execute(delete(Tool).where(Tool.id == tool_id))
+        if not result.rowcount:
             raise ValueError(f"Tool with ID {tool_id} not found")
-
-        await self.session.delete(tool)
-        await self.session.flush()
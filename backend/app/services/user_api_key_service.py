@@ -1,14 +1,83 @@
 """User API key service - business logic for managing user LLM provider API keys."""
 
+import hashlib
+import secrets
+import time
 import uuid
-from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.user_api_key import UserApiKey
 from app.utils.encryption import encryption_service
 
+# (user ID, organization ID) -> (expires at, provider -> decrypted key). The playground
+# reads every key on each message; this skips the query and the Fernet decrypts. Entries
+# are dropped when a transaction in this process that saves or deletes one of the user's
+# keys commits.
+_api_keys_cache: dict[tuple[uuid.UUID, uuid.UUID], tuple[float, dict[str, str]]] = {}
+_API_KEYS_CACHE_SIZE = 10_000
+
+
+def _get_cached_api_keys(user_id: uuid.UUID, organization_id: uuid.UUID) -> dict[str, str] | None:
+    """Return the cached decrypted keys for a user, or None if missing or expired."""
+    entry = _api_keys_cache.get((user_id, organization_id))
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _cache_api_keys(
+    user_id: uuid.UUID, organization_id: uuid.UUID, api_keys: dict[str, str]
+) -> None:
+    """Cache a user's decrypted keys, evicting the oldest entry when full."""
+    ttl_seconds = settings.api_key_cache_ttl_seconds
+    if ttl_seconds <= 0:
+        return
+
+    key = (user_id, organization_id)
+    if key not in _api_keys_cache and len(_api_keys_cache) >= _API_KEYS_CACHE_SIZE:
+        # Dicts preserve insertion order, so the first key is the oldest
+        _api_keys_cache.pop(next(iter(_api_keys_cache)))
+
+    _api_keys_cache[key] = (time.monotonic() + ttl_seconds, api_keys)
+
+
+# Keyed BLAKE2b digest of a stored ciphertext -> (expires at, plaintext). Once the
+# per-user entry above expires, re-reading an unchanged key costs a hash instead of a
+# Fernet decrypt; a rotated key has a new ciphertext (Fernet uses a random IV), so it
+# simply misses. Entries share the per-user TTL and are dropped when their key is
+# replaced or deleted. The hash key is random per process, so digests are meaningless
+# outside it.
+_decrypted_keys: dict[bytes, tuple[float, str]] = {}
+_DECRYPTED_KEYS_SIZE = 10_000
+_CIPHERTEXT_HASH_KEY = secrets.token_bytes(32)
+
+
+def _ciphertext_digest(encrypted_api_key: str) -> bytes:
+    """Return the keyed digest identifying a stored ciphertext."""
+    return hashlib.blake2b(
+        encrypted_api_key.encode(), digest_size=16, key=_CIPHERTEXT_HASH_KEY
+    ).digest()
+
+
+def _decrypt_api_key(encrypted_api_key: str) -> str:
+    """Decrypt a stored API key, reusing the result for an identical ciphertext."""
+    digest = _ciphertext_digest(encrypted_api_key)
+    entry = _decrypted_keys.get(digest)
+    if entry is not None and entry[0] >= time.monotonic():
+        return entry[1]
+
+    api_key = encryption_service.decrypt(encrypted_api_key)
+    ttl_seconds = settings.api_key_cache_ttl_seconds
+    if ttl_seconds > 0:
+        if digest not in _decrypted_keys and len(_decrypted_keys) >= _DECRYPTED_KEYS_SIZE:
+            # Dicts preserve insertion order, so the first key is the oldest
+            _decrypted_keys.pop(next(iter(_decrypted_keys)))
+        _decrypted_keys[digest] = (time.monotonic() + ttl_seconds, api_key)
+    return api_key
+
 
 class UserApiKeyService:
     """Service for managing user API keys. Keeps methods small and focused."""
@@ -16,6 +85,27 @@ class UserApiKeyService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def _invalidate_cache_on_commit(
+        self, user_id: uuid.UUID, organization_id: uuid.UUID, replaced_key: UserApiKey | None
+    ) -> None:
+        """
+        Drop the user's cached keys once the session's transaction commits.
+
+        Dropping them before the commit would let a concurrent read re-cache the old keys
+        while the change is not yet visible to other sessions. The decrypted plaintext of
+        a replaced or deleted key is dropped too.
+        """
+        replaced_digest = (
+            _ciphertext_digest(replaced_key.encrypted_api_key) if replaced_key else None
+        )
+
+        def invalidate(_session) -> None:
+            _api_keys_cache.pop((user_id, organization_id), None)
+            if replaced_digest is not None:
+                _decrypted_keys.pop(replaced_digest, None)
+
+        event.listen(self.session.sync_session, "after_commit", invalidate, once=True)
+
     async def save_api_key(
         self,
         user_id: uuid.UUID,
@@ -37,13 +127,12 @@ class UserApiKeyService:
         """
         # Check if API key already exists for this user + provider
         existing = await self.get_api_key_record(user_id, organization_id, provider)
+        self._invalidate_cache_on_commit(user_id, organization_id, existing)
 
         if existing:
             # Update existing
             existing.encrypted_api_key = encryption_service.encrypt(api_key)
-            existing.updated_at = datetime.utcnow()
             await self.session.flush()
-            await self.session.refresh(existing)
             return existing
         else:
             # Create new
@@ -55,7 +144,6 @@ class UserApiKeyService:
             )
             self.session.add(user_api_key)
             await self.session.flush()
-            await self.session.refresh(user_api_key)
             return user_api_key
 
     async def get_api_key_record(
@@ -84,10 +172,14 @@ class UserApiKeyService:
         Returns:
             Decrypted API key or None if not found
         """
+        api_keys = _get_cached_api_keys(user_id, organization_id)
+        if api_keys is not None:
+            return api_keys.get(provider)
+
         record = await self.get_api_key_record(user_id, organization_id, provider)
         if not record:
             return None
-        return encryption_service.decrypt(record.encrypted_api_key)
+        return _decrypt_api_key(record.encrypted_api_key)
 
     async def get_all_api_keys(
         self, user_id: uuid.UUID, organization_id: uuid.UUID
@@ -102,23 +194,28 @@ class UserApiKeyService:
         Returns:
             Dictionary mapping provider name to decrypted API key
         """
-        query = select(UserApiKey).where(
-            UserApiKey.user_id == user_id,
-            UserApiKey.organization_id == organization_id,
-        )
-        result = await self.session.execute(query)
-        records = result.scalars().all()
+        api_keys = _get_cached_api_keys(user_id, organization_id)
+        if api_keys is None:
+            query = select(UserApiKey).where(
+                UserApiKey.user_id == user_id,
+                UserApiKey.organization_id == organization_id,
+            )
+            result = await self.session.execute(query)
+            api_keys = {
+                record.provider: _decrypt_api_key(record.encrypted_api_key)
+                for record in result.scalars()
+            }
+            _cache_api_keys(user_id, organization_id, api_keys)
 
-        return {
-            record.provider: encryption_service.decrypt(record.encrypted_api_key)
-            for record in records
-        }
+        # Callers get their own dict so the cached one is never modified
+        return dict(api_keys)
 
     async def delete_api_key(
         self, user_id: uuid.UUID, organization_id: uuid.UUID, provider: str
     ) -> bool:
         """Delete user API key for a provider."""
         record = await self.get_api_key_record(user_id, organization_id, provider)
+        self._invalidate_cache_on_commit(user_id, organization_id, record)
         if not record:
             return False
 
@@ -1,15 +1,35 @@
 """Custom API tool implementation with full authentication support."""
 
+import asyncio
+import base64
+import json
+import logging
+import random
+import re
 from datetime import datetime, timedelta
 from typing import Any
+from urllib.parse import quote, urlencode
 
 import httpx
 
 from app.llm.factory import LLMProviderFactory
 from app.tools.base_tool import BaseTool
 from app.utils.encryption import encryption_service
+from app.utils.http_client import get_http_client
 from app.utils.output_transformer import OutputTransformer
 
+logger = logging.getLogger(__name__)
+
+_HTTP_METHODS = frozenset({"GET", "POST", "PUT", "DELETE", "PATCH"})
+_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+# Token refresh attempts on network errors, backing off exponentially (with jitter) between them
+_TOKEN_REFRESH_ATTEMPTS = 3
+_TOKEN_REFRESH_BACKOFF_SECONDS = 0.2
+
+# Path parameter placeholders in an endpoint, e.g. "/items/{item_id}"
+_URL_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
 
 class APITool(BaseTool):
     """
@@ -21,9 +41,15 @@ class APITool(BaseTool):
         super().__init__(tool_id, config)
 
         self.endpoint = config.get("endpoint", "")
+        self._url_placeholders = frozenset(_URL_PLACEHOLDER.findall(self.endpoint))
         self.method = config.get("method", "GET")
+        # Only POST/PUT/PATCH send the input as a JSON body
+        self._sends_json_body = self.method in _BODY_METHODS
         self.auth_type = config.get("authentication", "none")
         self.timeout = config.get("timeout", 30)
+        # Only reads run concurrently with other calls: writes may depend on each other's
+        # order, and OAuth tools refresh (and may rotate) the token on their shared config
+        self.parallel_safe = self.method in ("GET", "HEAD") and self.auth_type != "oauth"
 
         # Output transformation settings
         self.output_mode = config.get("output_mode", "full")  # "full", "extract", "llm"
@@ -37,10 +63,12 @@ class APITool(BaseTool):
         self.llm_pre_instructions = config.get("llm_pre_instructions")
         self.llm_post_instructions = config.get("llm_post_instructions")
 
+        # Decrypted auth headers and the encrypted config values they were built from
+        self._headers_cache: dict[str, str] | None = None
+        self._headers_cache_key: tuple | None = None
+
     async def execute(self, input_data: dict[str, Any]) -> dict[str, Any]:
         """Execute the API tool with authentication and optional output transformation."""
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info(f"APITool.execute called: name={self.name}, input={input_data}, endpoint={self.endpoint}")
 
         try:
@@ -88,10 +116,6 @@ class APITool(BaseTool):
 
     async def _make_api_call(self, input_data: dict[str, Any]) -> Any:
         """Make HTTP request with authentication."""
-        import logging
-        from urllib.parse import urlencode
-        logger = logging.getLogger(__name__)
-
         headers = await self._build_headers()
         url, remaining_params = self._build_url(input_data)
 
@@ -107,56 +131,87 @@ class APITool(BaseTool):
 
         logger.error(f"[DEBUG] Final URL: {url}")
 
-        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-            # Retry logic for OAuth token refresh
-            for attempt in range(2):
-                try:
-                    # Make HTTP request based on method
-                    if self.method == "GET":
-                        response = await client.get(url, headers=headers)
-                    elif self.method == "POST":
-                        response = await client.post(url, headers=headers, json=input_data)
-                    elif self.method == "PUT":
-                        response = await client.put(url, headers=headers, json=input_data)
-                    elif self.method == "DELETE":
-                        response = await client.delete(url, headers=headers)
-                    elif self.method == "PATCH":
-                        response = await client.patch(url, headers=headers, json=input_data)
-                    else:
-                        raise ValueError(f"Unsupported HTTP method: {self.method}")
-
-                    # Check for 401 and refresh OAuth token if needed
-                    if response.status_code == 401 and self.auth_type == "oauth" and attempt == 0:
-                        await self._refresh_oauth_token()
-                        headers = await self._build_headers()
-                        continue
-
-                    response.raise_for_status()
-
-                    # Check content type to handle different response types
-                    content_type = response.headers.get("content-type", "").lower()
-
-                    # If response is an image, return the URL instead of the image data
-                    if content_type.startswith("image/"):
-                        logger.info(f"Response is an image ({content_type}), returning URL instead of binary data")
-                        return url
-
-                    # Try to parse as JSON, otherwise return text
-                    if response.content:
-                        try:
-                            return response.json()
-                        except Exception:
-                            # Not JSON - return as plain text
-                            return response.text
-                    return ""
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 401 and attempt == 0:
-                        continue
-                    raise
+        if self.method not in _HTTP_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {self.method}")
+        json_body = input_data if self._sends_json_body else None
+
+        # Shared client keeps connections to the API alive between tool calls
+        client = get_http_client()
+
+        # Retry logic for OAuth token refresh
+        for attempt in range(2):
+            try:
+                response = await client.request(
+                    self.method,
+                    url,
+                    headers=headers,
+                    json=json_body,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                )
+
+                # Check for 401 and refresh OAuth token if needed
+                if response.status_code == 401 and self.auth_type == "oauth" and attempt == 0:
+                    await self._refresh_oauth_token()
+                    headers = await self._build_headers()
+                    continue
+
+                response.raise_for_status()
+
+                # Check content type to handle different response types
+                content_type = response.headers.get("content-type", "").lower()
+
+                # If response is an image, return the URL instead of the image data
+                if content_type.startswith("image/"):
+                    logger.info(f"Response is an image ({content_type}), returning URL instead of binary data")
+                    return url
+
+                # Try to parse as JSON, otherwise return text
+                if response.content:
+                    try:
+                        return response.json()
+                    except Exception:
+                        # Not JSON - return as plain text
+                        return response.text
+                return ""
+
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 401 and attempt == 0:
+                    continue
+                raise
 
     async def _build_headers(self) -> dict[str, str]:
-        """Build HTTP headers with authentication."""
+        """
+        Build HTTP headers with authentication.
+
+        Credentials are decrypted once and reused until the stored (encrypted)
+        values change, e.g. after an OAuth token refresh.
+
+        Returns:
+            New headers dict (safe for the caller to modify)
+        """
+        cache_key = self._auth_config_key()
+        if self._headers_cache is None or self._headers_cache_key != cache_key:
+            self._headers_cache = self._decrypt_headers()
+            self._headers_cache_key = cache_key
+        return dict(self._headers_cache)
+
+    def _auth_config_key(self) -> tuple:
+        """Identify the stored auth settings the headers are built from."""
+        config = self.config
+        return (
+            self.auth_type,
+            config.get("api_key_header"),
+            config.get("api_key_value"),
+            config.get("bearer_token"),
+            config.get("username"),
+            config.get("password"),
+            config.get("access_token"),
+            tuple(config.get("custom_headers", {}).items()),
+        )
+
+    def _decrypt_headers(self) -> dict[str, str]:
+        """Build HTTP headers, decrypting the configured credentials."""
         headers = {}
 
         # Only set Content-Type for requests with body
@@ -180,8 +235,6 @@ class APITool(BaseTool):
             username = self.config.get("username", "")
             encrypted_password = self.config.get("password", "")
             if encrypted_password:
-                import base64
-
                 password = encryption_service.decrypt(encrypted_password)
                 credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
                 headers["Authorization"] = f"Basic {credentials}"
@@ -210,25 +263,36 @@ class APITool(BaseTool):
 
         refresh_token = encryption_service.decrypt(refresh_token_encrypted)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                token_url,
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                    "client_id": self.config.get("oauth_client_id"),
-                    "client_secret": self.config.get("oauth_client_secret"),
-                },
-            )
-            response.raise_for_status()
+        # Retry transient network failures with exponential backoff
+        for attempt in range(_TOKEN_REFRESH_ATTEMPTS):
+            try:
+                response = await get_http_client().post(
+                    token_url,
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": refresh_token,
+                        "client_id": self.config.get("oauth_client_id"),
+                        "client_secret": self.config.get("oauth_client_secret"),
+                    },
+                )
+                break
+            except httpx.TransportError as e:
+                if attempt == _TOKEN_REFRESH_ATTEMPTS - 1:
+                    raise
+                backoff = _TOKEN_REFRESH_BACKOFF_SECONDS * 2 ** attempt
+                backoff += random.uniform(0, backoff)
+                logger.warning(f"Token refresh failed ({e!r}), retrying in {backoff:.2f}s")
+                await asyncio.sleep(backoff)
+        response.raise_for_status()
 
-            token_data = response.json()
-            new_access_token = token_data.get("access_token")
-            expiry_seconds = token_data.get("expires_in", 3600)
+        token_data = response.json()
+        new_access_token = token_data.get("access_token")
+        expiry_seconds = token_data.get("expires_in", 3600)
 
-            # Update config with new token (in production, save to database)
-            self.config["access_token"] = encryption_service.encrypt(new_access_token)
-            self.config["token_expiry"] = datetime.utcnow() + timedelta(seconds=expiry_seconds)
+        # Update config with new token (in production, save to database)
+        self.config["access_token"] = encryption_service.encrypt(new_access_token)
+        self.config["token_expiry"] = datetime.utcnow() + timedelta(seconds=expiry_seconds)
+        self._headers_cache = None
 
     def _build_url(self, input_data: dict[str, Any]) -> tuple[str, dict[str, Any]]:
         """
@@ -238,19 +302,21 @@ class APITool(BaseTool):
             Tuple of (url, remaining_params) where remaining_params are inputs
             that weren't used in URL templating
         """
-        from urllib.parse import quote
 
-        url = self.endpoint
-        used_keys = set()
+        # Placeholders were extracted from the endpoint once, at construction
+        used_keys = self._url_placeholders.intersection(input_data)
+        if not used_keys:
+            return self.endpoint, dict(input_data)
+
+        def substitute(match: re.Match) -> str:
+            key = match[1]
+            if key not in used_keys:
+                return match[0]
+            # URL-encode the value but preserve special chars like |, :, ,
+            return quote(str(input_data[key]), safe=':,|')
 
-        # Replace template variables with URL-encoded values
-        for key, value in input_data.items():
-            template = f"{{{key}}}"
-            if template in url:
-                # URL-encode the value but preserve special chars like |, :, ,
-                encoded_value = quote(str(value), safe=':,|')
-                url = url.replace(template, encoded_value)
-                used_keys.add(key)
+        # Replace all template variables in one pass
+        url = _URL_PLACEHOLDER.sub(substitute, self.endpoint)
 
         # Return remaining params that weren't used in URL template
         remaining_params = {k: v for k, v in input_data.items() if k not in used_keys}
@@ -302,7 +368,6 @@ class APITool(BaseTool):
         )
 
         # Parse LLM output as JSON
-        import json
 
         try:
             return json.loads(result)
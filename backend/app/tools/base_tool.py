@@ -1,8 +1,75 @@
 """Base tool abstract class."""
 
+import functools
+import json
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
+# Python types accepted for each JSON Schema type (bool is excluded from numbers below)
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_input_validator(input_schema_json: str) -> Callable[[dict[str, Any]], str | None]:
+    """
+    Compile an input schema into a validator function.
+
+    Only required fields and the declared types of top-level properties are checked.
+    Compiled validators are shared by every tool with the same schema.
+
+    Args:
+        input_schema_json: JSON Schema for the tool input, encoded with sorted keys
+
+    Returns:
+        Function returning an error message for invalid input, or None if valid
+    """
+    input_schema = json.loads(input_schema_json)
+    required = tuple(input_schema.get("required", []))
+    typed_properties = []
+    for name, prop in input_schema.get("properties", {}).items():
+        if not isinstance(prop, dict):
+            continue
+        # A type may be a list, e.g. ["string", "null"] for a nullable parameter; None is
+        # always accepted, so "null" needs no check of its own
+        declared = prop.get("type")
+        type_names = [declared] if isinstance(declared, str) else declared
+        if not isinstance(type_names, list):
+            continue
+        type_names = [type_name for type_name in type_names if type_name != "null"]
+        if not type_names or not all(
+            isinstance(type_name, str) and type_name in _JSON_TYPES for type_name in type_names
+        ):
+            continue
+        python_types = tuple(t for type_name in type_names for t in _JSON_TYPES[type_name])
+        typed_properties.append(
+            (name, " or ".join(type_names), python_types, "boolean" in type_names)
+        )
+
+    def validate(input_data: dict[str, Any]) -> str | None:
+        missing = [field for field in required if field not in input_data]
+        if missing:
+            return f"Missing required parameters: {', '.join(missing)}"
+
+        for name, type_label, python_types, allows_bool in typed_properties:
+            value = input_data.get(name)
+            if value is None:
+                continue
+            # bool subclasses int, so it only matches when "boolean" is declared
+            if not isinstance(value, python_types) or (isinstance(value, bool) and not allows_bool):
+                return f"Parameter '{name}' must be of type {type_label}"
+
+        return None
+
+    return validate
+
 
 class BaseTool(ABC):
     """
@@ -10,6 +77,13 @@ class BaseTool(ABC):
     Keep implementations under 200 lines and focused.
     """
 
+    # Whether the tool may execute concurrently with other tools from the same LLM turn.
+    # Opt-in: only tools without shared state or ordering-sensitive side effects.
+    parallel_safe: bool = False
+
+    # Compiled on first validation, from get_schema()
+    _input_validator: Callable[[dict[str, Any]], str | None] | None = None
+
     def __init__(self, tool_id: str, config: dict[str, Any]):
         self.tool_id = tool_id
         self.config = config
@@ -47,6 +121,23 @@ class BaseTool(ABC):
         """
         pass
 
+    def get_input_error(self, input_data: dict[str, Any]) -> str | None:
+        """
+        Validate input parameters against schema.
+
+        Args:
+            input_data: Input parameters to validate
+
+        Returns:
+            Error message describing the invalid input, or None if valid
+        """
+        if self._input_validator is None:
+            input_schema = self.get_schema().get("input_schema") or {}
+            self._input_validator = _compile_input_validator(
+                json.dumps(input_schema, sort_keys=True)
+            )
+        return self._input_validator(input_data)
+
     def validate_input(self, input_data: dict[str, Any]) -> bool:
         """
         Validate input parameters against schema.
@@ -57,10 +148,4 @@ class BaseTool(ABC):
         Returns:
             True if valid, False otherwise
         """
-        # Basic validation - can be enhanced with jsonschema
-        schema = self.get_schema()
-        input_schema = schema.get("input_schema", {})
-        required = input_schema.get("required", [])
-
-        # Check required fields
-        return all(field in input_data for field in required)
+        return self.get_input_error(input_data) is None
@@ -101,7 +101,6 @@ async def create_agent(
 
     session.add(agent)
     await session.flush()
-    await session.refresh(agent)
     await session.commit()  # Explicit commit so agent is visible to other sessions
 
     return {
@@ -134,7 +133,6 @@ async def create_integration(
 
     session.add(integration)
     await session.flush()
-    await session.refresh(integration)
     await session.commit()  # Explicit commit so integration is visible to other sessions
 
     return {
@@ -206,7 +204,6 @@ async def create_api_tool(
 
     session.add(tool)
     await session.flush()
-    await session.refresh(tool)
     await session.commit()  # Explicit commit so tool is visible to other sessions
 
     return {
@@ -16,6 +16,9 @@ class LLMTool(BaseTool):
     Stateless - no conversation history.
     """
 
+    # Stateless LLM calls with no shared state
+    parallel_safe = True
+
     def __init__(
         self,
         tool_id: str,
@@ -60,7 +63,7 @@ class LLMTool(BaseTool):
                     "error": f"No API key configured for {provider_type}",
                 }
 
-            # Create LLM provider
+            # Get LLM provider (shared instance - do not close)
             provider = LLMProviderFactory.create_provider(provider_type, self.api_key)
 
             # Build prompt from instructions and input
@@ -85,10 +88,6 @@ class LLMTool(BaseTool):
 
                 logger.info(f"Structured output generated successfully: {structured_result}")
 
-                # Clean up provider
-                if hasattr(provider, 'close'):
-                    await provider.close()
-
                 return {
                     "success": True,
                     **structured_result,  # Spread structured fields directly
@@ -110,10 +109,6 @@ class LLMTool(BaseTool):
 
                 logger.info(f"Freeform text generated successfully, length: {len(response_text)}")
 
-                # Clean up provider
-                if hasattr(provider, 'close'):
-                    await provider.close()
-
                 return {
                     "success": True,
                     "result": response_text,
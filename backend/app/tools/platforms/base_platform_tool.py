@@ -164,7 +164,9 @@ class BasePlatformTool(BaseTool, ABC):
 
                     async for session in get_database_session():
                         oauth_service = OAuthService(session)
-                        new_token = await oauth_service.refresh_token(self.integration.id)
+                        new_token = await oauth_service.refresh_token(
+                            self.integration.id, rejected_token=access_token
+                        )
 
                         # Retry request with new token
                         headers["Authorization"] = f"Bearer {new_token}"
@@ -289,7 +291,6 @@ class BasePlatformTool(BaseTool, ABC):
 
             # Commit changes
             await session.commit()
-            await session.refresh(integration)
 
             # Update self.integration with new values
             self.integration.config = integration.config
@@ -0,0 +1,45 @@
+"""Shared HTTP client for outbound requests."""
+
+import contextlib
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    Reusing one client keeps connections (and their TLS sessions) alive between
+    requests to the same host. Callers must not close it; it is closed on
+    application shutdown via close_http_client().
+
+    The client never stores cookies: it is shared by every tenant's tools and
+    OAuth exchanges, so a Set-Cookie from one response must not be replayed on
+    another tenant's request.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            # Fail fast on connecting/queueing; allow slow providers time to respond
+            timeout=httpx.Timeout(connect=5.0, read=15.0, write=5.0, pool=5.0),
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=50, keepalive_expiry=15.0
+            ),
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        with contextlib.suppress(Exception):
+            await client.aclose()
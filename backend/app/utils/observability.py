@@ -104,8 +104,61 @@ class ObservabilityService:
         except Exception:
             pass
 
+    def trace_tool_executions(self, executions: list[dict[str, Any]]) -> None:
+        """
+        Trace a batch of tool executions.
+
+        Args:
+            executions: Keyword arguments for trace_tool_execution, one dict per execution
+        """
+        if not self.enabled:
+            return
+
+        for execution in executions:
+            self.trace_tool_execution(**execution)
+
+    def trace_failed_turn(
+        self,
+        name: str,
+        input_data: dict[str, Any],
+        error: str | None,
+        executions: list[dict[str, Any]],
+    ) -> None:
+        """
+        Trace a failed turn that was sampled out, as a standalone trace.
+
+        Sampled-out turns run without a trace in context, so the failure is sent through
+        the client directly, with one span per tool execution.
+
+        Args:
+            name: Trace name
+            input_data: Turn input
+            error: Error message, or None if only tool executions failed
+            executions: Keyword arguments for trace_tool_execution, one dict per execution
+        """
+        if not self.enabled:
+            return
+
+        try:
+            trace = self.client.trace(
+                name=name, input=input_data, output=error, metadata={"sampled": False}
+            )
+            for execution in executions:
+                trace.span(
+                    name=f"tool_{execution['tool_name']}",
+                    input=execution["input_data"],
+                    output=execution["output_data"],
+                    metadata={
+                        "tool_name": execution["tool_name"],
+                        "duration_ms": execution["duration_ms"],
+                        "success": execution["success"],
+                    },
+                )
+        except Exception:
+            pass
+
     def flush(self) -> None:
-        """Flush pending traces to LangFuse."""
+        """Flush pending traces to LangFuse (blocking - called on application shutdown)."""
         if self.enabled and self.client:
             try:
                 self.client.flush()
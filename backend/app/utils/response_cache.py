@@ -0,0 +1,91 @@
+"""In-process cache for repeated first-turn agent responses."""
+
+import hashlib
+import json
+import time
+from typing import Any
+
+from app.config import settings
+
+
+class ResponseCache:
+    """
+    Caches final agent responses for identical opening messages. Focused on skipping LLM calls.
+
+    Only responses that needed no tool calls are cached, since tool calls can have side effects
+    and their results go stale. Entries are keyed by everything that shapes the response:
+    agent, model config, instructions, tool schemas and the exact user message. The user is part
+    of the key too, so one user's response is never served to another.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[float, str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is turned on (a TTL of 0 disables it)."""
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def build_key(
+        agent_id: str,
+        user_id: str | None,
+        model_config: dict[str, Any],
+        instructions: str,
+        tool_schemas: list[dict[str, Any]],
+        user_message: str,
+    ) -> str:
+        """
+        Build a cache key for an agent request.
+
+        Args:
+            agent_id: Agent ID
+            user_id: ID of the user sending the message (None for anonymous requests)
+            model_config: Agent model configuration
+            instructions: Agent instructions
+            tool_schemas: Tool schemas sent to the LLM
+            user_message: User's message, matched exactly
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [agent_id, user_id, model_config, instructions, tool_schemas, user_message],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response, evicting the oldest entry when full."""
+        if not self.enabled:
+            return
+
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            # Dicts preserve insertion order, so the first key is the oldest
+            self._entries.pop(next(iter(self._entries)))
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+
+# Global instance
+response_cache = ResponseCache(ttl_seconds=settings.response_cache_ttl_seconds)
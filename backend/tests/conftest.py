@@ -7,8 +7,11 @@ from collections.abc import AsyncGenerator
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import StaticPool
 
+import app.models  # noqa: F401
+import app.models.agent_permission  # noqa: F401
+import app.models.llm_model  # noqa: F401
 from app.database import Base
 from app.models.agent import Agent
 
@@ -24,11 +27,13 @@ def event_loop():
 @pytest.fixture(scope="function")
 async def test_session() -> AsyncGenerator[AsyncSession, None]:
     """Create test database session."""
-    # Use in-memory SQLite for testing
+    # Use in-memory SQLite for testing; StaticPool keeps the single connection
+    # (and with it the in-memory database) alive for the whole test
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
         echo=False,
-        poolclass=NullPool,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
     )
 
     # Create tables
@@ -0,0 +1,72 @@
+"""Unit tests for APITool."""
+
+import httpx
+import pytest
+
+from app.tools import api_tool
+from app.tools.api_tool import APITool
+from app.utils import http_client
+from app.utils.encryption import encryption_service
+
+
+@pytest.mark.asyncio
+async def test_auth_headers_are_decrypted_once(monkeypatch):
+    """Test credentials are decrypted again only when the stored value changes."""
+    tool = APITool(
+        "tool-1",
+        {
+            "name": "orders",
+            "authentication": "bearer",
+            "bearer_token": encryption_service.encrypt("first-token"),
+        },
+    )
+    decrypt_calls = 0
+    decrypt = encryption_service.decrypt
+
+    def counting_decrypt(value):
+        nonlocal decrypt_calls
+        decrypt_calls += 1
+        return decrypt(value)
+
+    monkeypatch.setattr(api_tool.encryption_service, "decrypt", counting_decrypt)
+
+    headers = await tool._build_headers()
+    headers["X-Extra"] = "1"
+    assert await tool._build_headers() == {"Authorization": "Bearer first-token"}
+    assert decrypt_calls == 1
+
+    tool.config["bearer_token"] = encryption_service.encrypt("second-token")
+    assert await tool._build_headers() == {"Authorization": "Bearer second-token"}
+    assert decrypt_calls == 2
+
+
+def test_build_url_substitutes_path_parameters():
+    """Test placeholders are filled and the other inputs are left for the query string."""
+    tool = APITool("tool-2", {"name": "item", "endpoint": "https://api.test/{site}/items/{item-id}"})
+
+    url, remaining = tool._build_url({"site": "MLA", "item-id": "a b|c", "limit": 5})
+
+    assert url == "https://api.test/MLA/items/a%20b|c"
+    assert remaining == {"limit": 5}
+
+
+@pytest.mark.asyncio
+async def test_response_cookies_do_not_carry_over(monkeypatch):
+    """Test a cookie set by one tool call is not sent on the next one."""
+    sent_cookies = []
+
+    def handler(request):
+        sent_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, json={}, headers={"set-cookie": "session=tenant-a; Path=/"})
+
+    client = http_client.get_http_client()
+    monkeypatch.setattr(client, "_transport", httpx.MockTransport(handler))
+    tool = APITool("tool-3", {"name": "ping", "endpoint": "https://api.test/ping"})
+
+    try:
+        await tool._make_api_call({})
+        await tool._make_api_call({})
+    finally:
+        await http_client.close_http_client()
+
+    assert sent_cookies == [None, None]
@@ -0,0 +1,79 @@
+"""Unit tests for BaseTool input validation."""
+
+from typing import Any
+
+from app.tools.base_tool import BaseTool
+
+
+class SchemaTool(BaseTool):
+    """Tool with a typed input schema."""
+
+    async def execute(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        return {"success": True}
+
+    def get_schema(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                    "limit": {"type": "integer"},
+                    "site": {"type": ["string", "null"]},
+                    "page": {"type": ["integer", "string"]},
+                },
+                "required": ["query"],
+            },
+        }
+
+
+def test_valid_input():
+    """Test matching input passes validation."""
+    tool = SchemaTool("t", {"name": "search"})
+
+    assert tool.get_input_error({"query": "shoes", "limit": 5}) is None
+    assert tool.validate_input({"query": "shoes", "limit": None})
+
+
+def test_missing_required_field():
+    """Test missing required fields are reported."""
+    tool = SchemaTool("t", {"name": "search"})
+
+    assert tool.get_input_error({"limit": 5}) == "Missing required parameters: query"
+    assert not tool.validate_input({})
+
+
+def test_wrong_type():
+    """Test declared property types are enforced, without treating bools as integers."""
+    tool = SchemaTool("t", {"name": "search"})
+
+    assert tool.get_input_error({"query": 1}) == "Parameter 'query' must be of type string"
+    assert tool.get_input_error({"query": "x", "limit": True}) == (
+        "Parameter 'limit' must be of type integer"
+    )
+
+
+def test_validator_is_shared_between_tools():
+    """Test tools with the same schema reuse one compiled validator."""
+    first = SchemaTool("a", {"name": "search"})
+    second = SchemaTool("b", {"name": "search"})
+
+    first.validate_input({"query": "x"})
+    second.validate_input({"query": "x"})
+
+    assert first._input_validator is second._input_validator
+
+
+def test_union_types():
+    """Test a list of types accepts any of them, with "null" allowing None."""
+    tool = SchemaTool("t", {"name": "search"})
+
+    assert tool.get_input_error({"query": "x", "site": "MLA", "page": 2}) is None
+    assert tool.get_input_error({"query": "x", "site": None, "page": "2"}) is None
+    assert tool.get_input_error({"query": "x", "site": 1}) == (
+        "Parameter 'site' must be of type string"
+    )
+    assert tool.get_input_error({"query": "x", "page": True}) == (
+        "Parameter 'page' must be of type integer or string"
+    )
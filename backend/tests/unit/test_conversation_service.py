@@ -0,0 +1,95 @@
+"""Unit tests for ConversationService."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.agent import Agent
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services.conversation_service import ConversationService
+
+
+@pytest.fixture
+async def conversation(test_session: AsyncSession, sample_agent: Agent) -> Conversation:
+    """Create a conversation with 6 alternating user/agent messages."""
+    conversation = Conversation(agent_id=sample_agent.id, channel_type="playground")
+    test_session.add(conversation)
+    await test_session.flush()
+
+    started = datetime(2026, 1, 1)
+    for i in range(6):
+        test_session.add(Message(
+            conversation_id=conversation.id,
+            role="user" if i % 2 == 0 else "agent",
+            content=f"message {i}",
+            created_at=started + timedelta(seconds=i),
+        ))
+    await test_session.commit()
+
+    return conversation
+
+
+@pytest.mark.asyncio
+async def test_history_returns_first_messages(
+    test_session: AsyncSession, conversation: Conversation
+):
+    """Test the messages endpoint's history keeps the oldest messages, oldest first."""
+    service = ConversationService(test_session)
+
+    history = await service.get_conversation_history(conversation.id, limit=3)
+
+    assert history == [
+        {"role": "user", "content": "message 0"},
+        {"role": "assistant", "content": "message 1"},
+        {"role": "user", "content": "message 2"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_history_window_returns_most_recent_messages(
+    test_session: AsyncSession, conversation: Conversation
+):
+    """Test the window limit keeps the newest messages, returned oldest first."""
+    service = ConversationService(test_session)
+
+    _, history = await service.get_history_window(conversation.id, limit=3)
+
+    assert history == [
+        {"role": "assistant", "content": "message 3"},
+        {"role": "user", "content": "message 4"},
+        {"role": "assistant", "content": "message 5"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_history_window_reports_start(
+    test_session: AsyncSession, conversation: Conversation
+):
+    """Test the window start accounts for both the offset and the limit."""
+    service = ConversationService(test_session)
+
+    start, history = await service.get_history_window(conversation.id, limit=10, offset=2)
+    assert start == 2
+    assert [m["content"] for m in history] == ["message 2", "message 3", "message 4", "message 5"]
+
+    start, history = await service.get_history_window(conversation.id, limit=2, offset=2)
+    assert start == 4
+    assert [m["content"] for m in history] == ["message 4", "message 5"]
+
+
+@pytest.mark.asyncio
+async def test_save_message_updates_conversation(test_session: AsyncSession, sample_agent: Agent):
+    """Test saving the first user message sets the preview and title."""
+    service = ConversationService(test_session)
+    conversation = await service.get_or_create_conversation(
+        agent_id=sample_agent.id, conversation_id=None
+    )
+
+    message = await service.save_message(conversation.id, role="user", content="Find red shoes")
+
+    assert message.id is not None
+    assert message.created_at is not None
+    assert conversation.last_message_preview == "Find red shoes"
+    assert conversation.title == "Find red shoes"
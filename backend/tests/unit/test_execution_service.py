@@ -0,0 +1,378 @@
+"""Unit tests for AgentExecutionService helpers."""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.config import settings
+from app.services.agent_defaults import _render_tools_section, build_enhanced_system_prompt
+from app.services.execution_service import (
+    AgentExecutionService,
+    ExecutionEvent,
+    _DeltaBatcher,
+    _image_part_for_provider,
+    _with_flush_ticks,
+)
+from app.tools.api_tool import APITool
+from app.tools.base_tool import BaseTool
+from app.tools.factory import ToolFactory
+
+
+class SlowTool(BaseTool):
+    """Tool that records how many calls overlap."""
+
+    running = 0
+    max_running = 0
+
+    async def execute(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        SlowTool.running += 1
+        SlowTool.max_running = max(SlowTool.max_running, SlowTool.running)
+        await asyncio.sleep(0.01)
+        SlowTool.running -= 1
+        return {"success": True, "result": input_data["value"]}
+
+    def get_schema(self) -> dict[str, Any]:
+        return {"name": self.name, "description": "", "input_schema": {}}
+
+
+class ParallelSlowTool(SlowTool):
+    """Parallel-safe variant of SlowTool."""
+
+    parallel_safe = True
+
+
+@pytest.fixture
+def execution_service():
+    SlowTool.max_running = 0
+    return AgentExecutionService(session=None)
+
+
+def _tool_uses(name: str) -> list[dict[str, Any]]:
+    return [{"id": str(i), "name": name, "input": {"value": i}} for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_parallel_safe_tools_run_concurrently(execution_service: AgentExecutionService):
+    """Test parallel-safe tool calls overlap and report their request index."""
+    execution_service._tools["parallel"] = ParallelSlowTool("p", {"name": "parallel"})
+
+    calls = execution_service._execute_tool_calls(_tool_uses("parallel"))
+    results = sorted([(index, result["result"]) async for index, result, _ in calls])
+
+    assert results == [(0, 0), (1, 1), (2, 2)]
+    assert SlowTool.max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_other_tools_run_sequentially(execution_service: AgentExecutionService):
+    """Test tools that are not parallel-safe run one at a time."""
+    execution_service._tools["serial"] = SlowTool("s", {"name": "serial"})
+
+    calls = execution_service._execute_tool_calls(_tool_uses("serial"))
+    results = [(index, result["result"]) async for index, result, _ in calls]
+
+    assert results == [(0, 0), (1, 1), (2, 2)]
+    assert SlowTool.max_running == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("config", "max_running"),
+    [
+        ({"method": "GET"}, 3),
+        ({"method": "POST"}, 1),
+        ({"method": "GET", "authentication": "oauth"}, 1),
+    ],
+)
+async def test_only_plain_api_reads_run_concurrently(
+    execution_service: AgentExecutionService, monkeypatch, config, max_running
+):
+    """Test API tools that write or refresh OAuth tokens run one call at a time."""
+    tool = APITool("a", {"name": "api", "endpoint": "https://api.test", **config})
+    monkeypatch.setattr(tool, "execute", SlowTool("s", {}).execute)
+    execution_service._tools["api"] = tool
+
+    calls = execution_service._execute_tool_calls(_tool_uses("api"))
+    results = sorted([(index, result["result"]) async for index, result, _ in calls])
+
+    assert results == [(0, 0), (1, 1), (2, 2)]
+    assert SlowTool.max_running == max_running
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("sample_rate", "traced"), [(0.0, False), (1.0, True)])
+async def test_only_sampled_turns_run_in_a_trace(
+    execution_service, monkeypatch, sample_rate, traced
+):
+    """Test the Langfuse-traced turn is used only when the turn is sampled."""
+    calls = []
+
+    def fake_turn(name):
+        async def run(*args, trace_sampled):
+            calls.append((name, trace_sampled))
+            yield ExecutionEvent("message_complete")
+
+        return run
+
+    monkeypatch.setattr(settings, "trace_sample_rate", sample_rate)
+    monkeypatch.setattr(execution_service, "_execute_turn", fake_turn("plain"))
+    monkeypatch.setattr(execution_service, "_execute_traced_turn", fake_turn("traced"))
+
+    events = [e async for e in execution_service.execute_conversation(uuid.uuid4(), "Hi")]
+
+    assert len(events) == 1
+    assert calls == [("traced", True)] if traced else [("plain", False)]
+
+
+def test_execution_event_is_payload():
+    """Test events serialize as their payload without copying."""
+    event = ExecutionEvent("content_delta", delta="Hello")
+
+    assert event.type == "content_delta"
+    assert event == {"type": "content_delta", "delta": "Hello"}
+    assert isinstance(event, dict)
+
+
+def test_image_part_for_anthropic():
+    """Test data URL is split into media type and base64 payload."""
+    part = _image_part_for_provider("data:image/png;base64,iVBORw0KGgo=", "anthropic")
+
+    assert part == {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": "image/png",
+            "data": "iVBORw0KGgo=",
+        },
+    }
+
+
+def test_image_part_for_openai():
+    """Test OpenAI keeps the data URL as-is."""
+    url = "data:image/jpeg;base64,/9j/4AAQ"
+
+    part = _image_part_for_provider(url, "openai")
+
+    assert part == {"type": "image_url", "image_url": {"url": url}}
+
+
+def test_image_part_for_malformed_data_url():
+    """Test malformed data URLs are skipped."""
+    assert _image_part_for_provider("data:image/png,rawdata", "anthropic") is None
+    assert _image_part_for_provider("data:image/png;base64,", "anthropic") is None
+
+
+def test_tools_section_is_cached_per_schema_set():
+    """Test identical tool schemas reuse the rendered tools section."""
+    schemas = [{
+        "name": "search",
+        "description": "Search items",
+        "input_schema": {
+            "type": "object",
+            "properties": {"query": {"type": "string", "description": "Search text"}},
+            "required": ["query"],
+        },
+    }]
+    _render_tools_section.cache_clear()
+
+    first = build_enhanced_system_prompt("Be helpful", schemas)
+    second = build_enhanced_system_prompt("Be helpful", [dict(schemas[0])])
+
+    assert first == second
+    assert "- `query` (string) (REQUIRED): Search text\n" in first
+    assert _render_tools_section.cache_info().hits == 1
+
+
+class FakeSummaryProvider:
+    """Provider stub that records summarization prompts."""
+
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    async def generate_without_tools(
+        self, model, prompt, system=None, temperature=0.7, max_tokens=4096
+    ):
+        self.prompts.append(prompt)
+        return "Summary"
+
+
+class FakeConversationService:
+    """Conversation service stub that records saved summaries."""
+
+    def __init__(self, messages: list[dict[str, str]] | None = None):
+        self.messages = messages or []
+        self.saved: list[tuple[str, int]] = []
+
+    async def get_conversation_history(self, conversation_id, limit=50, offset=0):
+        return self.messages[offset:offset + limit]
+
+    async def save_summary(self, conversation, content, message_count):
+        self.saved.append((content, message_count))
+
+
+def _history(count: int) -> list[dict[str, str]]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " * 50}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_history_within_budget_is_not_summarized(execution_service, monkeypatch):
+    """Test short histories are sent as-is."""
+    monkeypatch.setattr(settings, "conversation_context_tokens", 100000)
+    provider = FakeSummaryProvider()
+    history = _history(4)
+
+    summary = await execution_service._maybe_summarize(
+        None, history, None, 0, 0, provider, "model"
+    )
+
+    assert summary is None
+    assert len(history) == 4
+    assert provider.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_long_history_keeps_recent_messages(execution_service, monkeypatch):
+    """Test older messages are folded into a stored summary."""
+    monkeypatch.setattr(settings, "conversation_context_tokens", 100)
+    monkeypatch.setattr(settings, "conversation_keep_recent_messages", 3)
+    execution_service.conversation_service = FakeConversationService()
+    provider = FakeSummaryProvider()
+    history = _history(10)
+
+    summary = await execution_service._maybe_summarize(
+        None, history, "Earlier", 6, 6, provider, "model"
+    )
+
+    # Kept messages start at a user message, so 4 are kept rather than 3
+    assert summary == "Summary"
+    assert [m["content"] for m in history] == [m["content"] for m in _history(10)[6:]]
+    assert provider.prompts[0].startswith("Summary so far:\nEarlier")
+    assert execution_service.conversation_service.saved == [("Summary", 12)]
+
+
+@pytest.mark.asyncio
+async def test_messages_past_history_limit_are_summarized(execution_service, monkeypatch):
+    """Test messages between the stored summary and the history window are folded in."""
+    monkeypatch.setattr(settings, "conversation_context_tokens", 100)
+    monkeypatch.setattr(settings, "conversation_keep_recent_messages", 3)
+    skipped = [{"role": "user", "content": f"skipped {i}"} for i in range(4)]
+    execution_service.conversation_service = FakeConversationService([None, None, *skipped])
+    provider = FakeSummaryProvider()
+    conversation = SimpleNamespace(id=uuid.uuid4())
+    history = _history(10)
+
+    await execution_service._maybe_summarize(
+        conversation, history, "Earlier", 2, 6, provider, "model"
+    )
+
+    prompt = provider.prompts[0]
+    assert "skipped 0" in prompt
+    assert prompt.index("skipped 3") < prompt.index("message 0")
+    assert execution_service.conversation_service.saved == [("Summary", 12)]
+
+
+def test_openai_round_reuses_streamed_arguments():
+    """Test the JSON streamed by the provider is sent back verbatim."""
+    messages: list[dict[str, Any]] = []
+    tool_use = {
+        "id": "call_1",
+        "name": "search",
+        "input": {"query": "shoes"},
+        "input_json": '{"query":"shoes"}',
+        "result": {"success": True},
+    }
+
+    AgentExecutionService._append_openai_round(messages, "", [tool_use], "")
+
+    assert messages[0]["tool_calls"][0]["function"]["arguments"] == '{"query":"shoes"}'
+
+
+def test_tool_round_builder_per_provider(execution_service: AgentExecutionService):
+    """Test Anthropic gets its own message format and other providers use OpenAI's."""
+    tool_use = {"id": "call_1", "name": "search", "input": {}, "result": {"success": True}}
+
+    anthropic_messages: list[dict[str, Any]] = []
+    execution_service._get_tool_round_builder("anthropic")(anthropic_messages, "", [tool_use], "")
+    google_messages: list[dict[str, Any]] = []
+    execution_service._get_tool_round_builder("google")(google_messages, "", [tool_use], "")
+
+    assert anthropic_messages[1]["content"][0]["type"] == "tool_result"
+    assert google_messages[1]["role"] == "tool"
+
+
+def test_delta_batcher_coalesces_small_deltas(monkeypatch):
+    """Test deltas are held until enough text accumulates, then sent as one."""
+    monkeypatch.setattr(time, "perf_counter", lambda: 0.0)
+    batcher = _DeltaBatcher()
+
+    assert batcher.add("Hello") is None
+    assert batcher.add(" world") is None
+    assert batcher.add("x" * 64) == "Hello world" + "x" * 64
+    assert batcher.flush() is None
+
+
+def test_delta_batcher_sends_after_frame_interval(monkeypatch):
+    """Test buffered text is sent once a frame interval has passed."""
+    now = [0.0]
+    monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+    batcher = _DeltaBatcher()
+
+    assert batcher.add("Hi") is None
+    now[0] = 0.02
+    assert batcher.add("!") == "Hi!"
+
+
+@pytest.mark.asyncio
+async def test_buffered_text_is_sent_while_stream_is_idle():
+    """Test buffered text is flushed on a timer when no further event arrives."""
+    batcher = _DeltaBatcher()
+
+    async def stream():
+        yield "Hi"
+        await asyncio.sleep(0.2)  # e.g. the provider streaming tool arguments
+        yield "!"
+
+    seen = []
+    async for event in _with_flush_ticks(stream(), batcher):
+        if event is None:
+            seen.append(("tick", batcher.flush()))
+        else:
+            seen.append(("event", batcher.add(event)))
+
+    assert seen == [("event", None), ("tick", "Hi"), ("event", "!")]
+
+
+def _agent_with_tool(updated_at: datetime) -> SimpleNamespace:
+    tool = SimpleNamespace(
+        id=uuid.UUID(int=1),
+        updated_at=updated_at,
+        name="search",
+        description="Search items",
+        tool_type="api",
+        tool_schema={"name": "search", "input_schema": {"type": "object", "properties": {}}},
+    )
+    return SimpleNamespace(
+        integrations=[SimpleNamespace(tools=[tool])], user_id=None, organization_id=None
+    )
+
+
+def test_tool_schemas_are_reused_until_a_tool_changes(execution_service, monkeypatch):
+    """Test unchanged tools share one schema list across turns, edits rebuild it."""
+    monkeypatch.setattr(ToolFactory, "create_tool", lambda tool, **kwargs: SlowTool(tool.name, {}))
+
+    first = execution_service._prepare_tools(_agent_with_tool(datetime(2026, 1, 1)), None, {})
+    second = execution_service._prepare_tools(_agent_with_tool(datetime(2026, 1, 1)), None, {})
+    edited = execution_service._prepare_tools(_agent_with_tool(datetime(2026, 1, 2)), None, {})
+
+    assert second is first
+    assert edited is not first
+    assert edited == first
+    assert "search" in execution_service._tools
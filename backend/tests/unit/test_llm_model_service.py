@@ -0,0 +1,47 @@
+"""Unit tests for LLMModelService."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.llm_model import LLMModel
+from app.services import llm_model_service
+from app.services.llm_model_service import LLMModelService
+
+
+@pytest.fixture(autouse=True)
+def clear_provider_cache():
+    llm_model_service._provider_cache.clear()
+    yield
+    llm_model_service._provider_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_providers_are_cached_between_sessions(test_session: AsyncSession):
+    """Test model routing is served from memory after the first lookup."""
+    model = LLMModel(model_id="custom-model", provider="openai", display_name="Custom")
+    test_session.add(model)
+    await test_session.commit()
+    service = LLMModelService(test_session)
+
+    assert await service.get_providers_for_models({"custom-model", "gemini-1.5-pro"}) == {
+        "custom-model": "openai",
+        "gemini-1.5-pro": "google",
+    }
+
+    await test_session.delete(model)
+    await test_session.commit()
+
+    assert await service.get_provider_for_model("custom-model") == "openai"
+
+
+def test_fallback_detection_uses_name_prefix():
+    """Test unknown models are routed by the prefix of their name."""
+    detect = LLMModelService._fallback_provider_detection
+
+    assert detect("claude-3-haiku") == "anthropic"
+    assert detect("o1-preview") == "openai"
+    assert detect("chatgpt-4o-latest") == "openai"
+    assert detect("ft:gpt-4o-mini-2024-07-18:acme::abc123") == "openai"
+    assert detect("ft:davinci-002:acme::abc123") == "openai"
+    assert detect("models/gemini-pro") == "google"
+    assert detect("mistral-large") == "anthropic"
@@ -0,0 +1,117 @@
+"""Unit tests for OAuthService."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.services import oauth_service
+
+
+def test_state_round_trip():
+    """Test a state token decodes to the integration and platform it was made for."""
+    integration_id = uuid.uuid4()
+    state = oauth_service._encode_state(integration_id, "mercadolibre")
+
+    assert oauth_service._decode_state(state) == (integration_id, "mercadolibre")
+
+
+def test_tampered_state_is_rejected():
+    """Test a state token whose payload was changed fails verification."""
+    state = oauth_service._encode_state(uuid.uuid4(), "mercadolibre")
+    tampered = ("A" if state[0] != "A" else "B") + state[1:]
+
+    with pytest.raises(ValueError, match="signature"):
+        oauth_service._decode_state(tampered)
+
+
+def test_expired_state_is_rejected(monkeypatch):
+    """Test a state token is rejected once its expiry has passed."""
+    state = oauth_service._encode_state(uuid.uuid4(), "mercadolibre")
+    monkeypatch.setattr(oauth_service.time, "time", lambda: 10**10)
+
+    with pytest.raises(ValueError, match="expired"):
+        oauth_service._decode_state(state)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_coalesced(test_session, monkeypatch):
+    """Test concurrent refreshes for one integration hit the provider once."""
+    calls = 0
+
+    async def fake_exchange(self, integration_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return "new-token"
+
+    monkeypatch.setattr(oauth_service.OAuthService, "_exchange_refresh_token", fake_exchange)
+    service = oauth_service.OAuthService(test_session)
+    integration_id = uuid.uuid4()
+
+    tokens = await asyncio.gather(*(service.refresh_token(integration_id) for _ in range(3)))
+
+    assert tokens == ["new-token"] * 3
+    assert calls == 1
+    assert integration_id not in oauth_service._refresh_inflight
+
+
+@pytest.mark.asyncio
+async def test_waiters_retry_when_refreshing_caller_is_cancelled(test_session, monkeypatch):
+    """Test cancelling the caller running a refresh does not cancel the callers waiting on it."""
+    started = asyncio.Event()
+    calls = 0
+
+    async def fake_exchange(self, integration_id):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return "new-token"
+
+    monkeypatch.setattr(oauth_service.OAuthService, "_exchange_refresh_token", fake_exchange)
+    service = oauth_service.OAuthService(test_session)
+    integration_id = uuid.uuid4()
+
+    leader = asyncio.create_task(service.refresh_token(integration_id))
+    await started.wait()
+    waiter = asyncio.create_task(service.refresh_token(integration_id))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "new-token"
+    assert leader.cancelled()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_token_refreshed_meanwhile_is_reused(test_session, monkeypatch):
+    """Test a caller gets the stored token when it differs from the one that was rejected."""
+    calls = 0
+
+    async def fake_exchange(self, integration_id):
+        nonlocal calls
+        calls += 1
+        return "newer-token"
+
+    async def get_credentials(integration_id):
+        return object()
+
+    async def decrypt_token(credential):
+        return "current-token"
+
+    monkeypatch.setattr(oauth_service.OAuthService, "_exchange_refresh_token", fake_exchange)
+    service = oauth_service.OAuthService(test_session)
+    monkeypatch.setattr(service.credential_service, "get_credentials", get_credentials)
+    monkeypatch.setattr(service.credential_service, "decrypt_token", decrypt_token)
+    integration_id = uuid.uuid4()
+
+    assert await service.refresh_token(integration_id, rejected_token="old-token") == (
+        "current-token"
+    )
+    assert calls == 0
+    assert await service.refresh_token(integration_id, rejected_token="current-token") == (
+        "newer-token"
+    )
+    assert calls == 1
@@ -0,0 +1,69 @@
+"""Unit tests for the response cache."""
+
+import time
+
+from app.utils.response_cache import ResponseCache
+
+
+def _key(message: str, instructions: str = "Be helpful", user_id: str = "user-1") -> str:
+    return ResponseCache.build_key(
+        "agent-1", user_id, {"model": "claude-sonnet-4-20250514"}, instructions, [], message
+    )
+
+
+def test_set_and_get():
+    """Test storing and retrieving a response."""
+    cache = ResponseCache(ttl_seconds=60)
+
+    cache.set(_key("Hello"), "Hi there!")
+
+    assert cache.get(_key("Hello")) == "Hi there!"
+
+
+def test_key_matches_message_exactly():
+    """Test messages differing only in whitespace or case get different keys."""
+    assert _key("Hello World") != _key("hello world")
+    assert _key("Hello World") != _key("Hello  World")
+
+
+def test_key_changes_with_user():
+    """Test one user's cached response is not shared with another user."""
+    assert _key("Hello") != _key("Hello", user_id="user-2")
+
+
+def test_key_changes_with_instructions():
+    """Test changing the agent configuration invalidates the key."""
+    assert _key("Hello") != _key("Hello", instructions="Be terse")
+
+
+def test_expired_entry_is_dropped(monkeypatch):
+    """Test expired entries are not returned."""
+    cache = ResponseCache(ttl_seconds=60)
+    cache.set(_key("Hello"), "Hi there!")
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert cache.get(_key("Hello")) is None
+
+
+def test_disabled_cache_stores_nothing():
+    """Test a TTL of 0 disables caching."""
+    cache = ResponseCache(ttl_seconds=0)
+
+    cache.set(_key("Hello"), "Hi there!")
+
+    assert not cache.enabled
+    assert cache.get(_key("Hello")) is None
+
+
+def test_evicts_oldest_when_full():
+    """Test the oldest entry is evicted at capacity."""
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+
+    cache.set(_key("one"), "1")
+    cache.set(_key("two"), "2")
+    cache.set(_key("three"), "3")
+
+    assert cache.get(_key("one")) is None
+    assert cache.get(_key("three")) == "3"
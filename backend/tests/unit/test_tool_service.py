@@ -0,0 +1,39 @@
+"""Unit tests for ToolService."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tool import Tool
+from app.services.tool_service import ToolService
+
+
+@pytest.mark.asyncio
+async def test_update_tool_changes_only_given_fields(test_session: AsyncSession):
+    """Test updating a tool leaves unset fields alone."""
+    tool = Tool(integration_id=uuid.uuid4(), name="orders", description="Fetch orders")
+    tool.updated_at = datetime(2026, 1, 1)
+    test_session.add(tool)
+    await test_session.flush()
+    service = ToolService(test_session)
+
+    updated = await service.update_tool(tool.id, name="get_orders", is_enabled=False)
+
+    assert updated.name == "get_orders"
+    assert updated.description == "Fetch orders"
+    assert updated.is_enabled is False
+    # Stamped in UTC, like the other timestamp columns
+    assert abs(updated.updated_at - datetime.utcnow()) < timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_tool(test_session: AsyncSession):
+    """Test updating or deleting an unknown tool raises."""
+    service = ToolService(test_session)
+
+    with pytest.raises(ValueError):
+        await service.update_tool(uuid.uuid4(), name="missing")
+    with pytest.raises(ValueError):
+        await service.delete_tool(uuid.uuid4())
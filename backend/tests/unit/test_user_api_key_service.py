@@ -0,0 +1,107 @@
+"""Unit tests for UserApiKeyService."""
+
+import time
+import uuid
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_api_key import UserApiKey
+from app.services import user_api_key_service
+from app.services.user_api_key_service import UserApiKeyService
+
+
+@pytest.fixture(autouse=True)
+def clear_api_keys_cache():
+    user_api_key_service._api_keys_cache.clear()
+    user_api_key_service._decrypted_keys.clear()
+    yield
+    user_api_key_service._api_keys_cache.clear()
+    user_api_key_service._decrypted_keys.clear()
+
+
+@pytest.mark.asyncio
+async def test_api_keys_are_cached_until_changed(test_session: AsyncSession):
+    """Test decrypted keys are served from memory until a saved key is committed."""
+    service = UserApiKeyService(test_session)
+    user_id, org_id = uuid.uuid4(), uuid.uuid4()
+    await service.save_api_key(user_id, org_id, "openai", "sk-first")
+    await test_session.commit()
+
+    assert await service.get_all_api_keys(user_id, org_id) == {"openai": "sk-first"}
+
+    # Rows removed behind the service's back are not noticed while cached
+    await test_session.execute(delete(UserApiKey))
+    assert await service.get_api_key(user_id, org_id, "openai") == "sk-first"
+
+    # A read before the commit can re-cache the old keys; the commit drops them again
+    await service.save_api_key(user_id, org_id, "anthropic", "sk-second")
+    assert await service.get_all_api_keys(user_id, org_id) == {"openai": "sk-first"}
+    await test_session.commit()
+    assert await service.get_all_api_keys(user_id, org_id) == {"anthropic": "sk-second"}
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_delete_keeps_cache(test_session: AsyncSession):
+    """Test a delete that is rolled back leaves the cached keys in place."""
+    service = UserApiKeyService(test_session)
+    user_id, org_id = uuid.uuid4(), uuid.uuid4()
+    await service.save_api_key(user_id, org_id, "openai", "sk-first")
+    await test_session.commit()
+    assert await service.get_all_api_keys(user_id, org_id) == {"openai": "sk-first"}
+
+    assert await service.delete_api_key(user_id, org_id, "openai")
+    await test_session.rollback()
+
+    assert (user_id, org_id) in user_api_key_service._api_keys_cache
+
+
+def test_identical_ciphertext_is_decrypted_once(monkeypatch):
+    """Test a stored key is decrypted once, while a re-encrypted key is decrypted again."""
+    encryption_service = user_api_key_service.encryption_service
+    first = encryption_service.encrypt("sk-test")
+    second = encryption_service.encrypt("sk-test")
+    decrypted = []
+    decrypt = encryption_service.decrypt
+    monkeypatch.setattr(
+        encryption_service, "decrypt", lambda value: decrypted.append(value) or decrypt(value)
+    )
+
+    for value in (first, first, second):
+        assert user_api_key_service._decrypt_api_key(value) == "sk-test"
+
+    assert decrypted == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_deleted_key_plaintext_is_dropped(test_session: AsyncSession):
+    """Test deleting a key removes its decrypted plaintext once committed."""
+    service = UserApiKeyService(test_session)
+    user_id, org_id = uuid.uuid4(), uuid.uuid4()
+    await service.save_api_key(user_id, org_id, "openai", "sk-first")
+    await test_session.commit()
+    assert await service.get_api_key(user_id, org_id, "openai") == "sk-first"
+    assert user_api_key_service._decrypted_keys
+
+    await service.delete_api_key(user_id, org_id, "openai")
+    await test_session.commit()
+
+    assert not user_api_key_service._decrypted_keys
+
+
+def test_decrypted_key_expires(monkeypatch):
+    """Test a decrypted key is decrypted again after the cache TTL."""
+    encrypted = user_api_key_service.encryption_service.encrypt("sk-test")
+    user_api_key_service._decrypt_api_key(encrypted)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10**6)
+    decrypted = []
+    monkeypatch.setattr(
+        user_api_key_service.encryption_service, "decrypt", lambda value: decrypted.append(value)
+    )
+
+    user_api_key_service._decrypt_api_key(encrypted)
+
+    assert decrypted == [encrypted]